@@ -0,0 +1,49 @@
+"""\
+Theme Benchmarks
+================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This package benchmarks the theme against synthetic Sphinx projects of
+increasing size, so that a change which makes the builds slower or the
+pages heavier shows up before it's merged.
+
+For every project size, the suite generates a corpus (see `corpus`),
+builds it from scratch in a fresh interpreter, and measures (see
+`stages`) the following::
+
+    [1] End-to-end build time and peak memory of the build.
+    [2] Time spent in the theme's stages, i.e., `postprocess`,
+        `make_toc_collapsible`, and `last_updated_date` in isolation,
+        and the directives (parsing and rendering) within the build.
+    [3] Average size of the generated pages.
+    [4] Average size of the pickled doctrees and the time to load the
+        pickled environment, which every incremental build pays for.
+
+The measurements are compared against the stored `baselines.json` and
+the run fails if any of them regresses beyond the threshold::
+
+    python -m benchmarks --threshold 0.25
+    python -m benchmarks --pages 100 1000 10000 --update
+
+The `reproducible` module builds a corpus twice and checks that both
+builds produce the same bytes::
+
+    python -m benchmarks.reproducible --pages 50
+
+The `headers` module serves a build through a stand-in for the static
+host, applying the theme's `_headers` manifest, and checks the caching
+policy of every file::
+
+    python -m benchmarks.headers --pages 20
+
+.. note::
+
+    Only the 100 pages project is measured by default, as rendering the
+    global ToC of every page makes the larger projects take a long
+    time to build. The baselines are machine dependent. Update them on
+    the machine that runs the comparisons, before making the change to
+    measure.
+"""
@@ -0,0 +1,105 @@
+"""\
+Benchmarks Runner
+=================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module runs the benchmarks for the requested project sizes and
+compares the results against the stored baselines.
+
+Every size is measured in a fresh interpreter. The run exits with
+a non-zero status if any metric is worse than its baseline by more
+than the threshold, e.g., 0.25 allows up to 25% regressions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import sys
+import typing as t
+from pathlib import Path
+
+from benchmarks import stages
+
+baselines: t.Final[Path] = Path(__file__).with_name("baselines.json")
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    stored: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Compare the results against the baselines.
+
+    :param results: Measurements by the project size.
+    :param stored: Baselines by the project size.
+    :param threshold: Allowed relative regression.
+    :return: Descriptions of the regressed metrics.
+    """
+    regressions: list[str] = []
+    for size, metrics in results.items():
+        for metric, value in metrics.items():
+            baseline = stored.get(size, {}).get(metric)
+            if baseline and value > baseline * (1 + threshold):
+                regressions.append(
+                    f"{size} pages: {metric} regressed from {baseline:.3f} "
+                    f"to {value:.3f} (+{value / baseline - 1:.0%})"
+                )
+    return regressions
+
+
+def report(
+    results: dict[str, dict[str, float]],
+    stored: dict[str, dict[str, float]],
+) -> None:
+    """Print the results side by side with the baselines."""
+    for size, metrics in results.items():
+        print(f"\n{size} pages")
+        for metric, value in metrics.items():
+            baseline = stored.get(size, {}).get(metric)
+            delta = f"{value / baseline - 1:+7.1%}" if baseline else ""
+            print(f"  {metric:<22} {value:12.3f} {delta}")
+
+
+def main() -> int:
+    """Run the benchmarks and return the exit status."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the theme against synthetic projects.",
+    )
+    parser.add_argument("--pages", nargs="+", type=int, default=[100])
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="store the results as the new baselines",
+    )
+    args = parser.parse_args()
+    stored = json.loads(baselines.read_text()) if baselines.is_file() else {}
+    results: dict[str, dict[str, float]] = {}
+    context = multiprocessing.get_context("spawn")
+    for pages in args.pages:
+        with context.Pool(1) as pool:
+            results[str(pages)] = pool.apply(
+                stages.measure, (pages, args.jobs, args.repeat)
+            )
+    report(results, stored)
+    if args.update:
+        stored.update(results)
+        text = json.dumps(stored, indent=2, sort_keys=True)
+        baselines.write_text(text + "\n", encoding="utf-8")
+        return 0
+    regressions = compare(results, stored, args.threshold)
+    for regression in regressions:
+        print(regression, file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""\
+Synthetic Corpus
+================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module generates synthetic Sphinx projects for the benchmarks.
+
+The pages are arranged as a tree where every page lists its children
+in a `toctree`, so the navigation gets deeper with the size of the
+project. Every page starts with an `author` block and, apart from
+prose and code, uses the theme's other directives (`picture`,
+`repository`, `thumbnail`, `video`, and `youtube`) and roles
+(`stylise` and `email`) at fixed intervals.
+
+The generated corpus is deterministic for a given size and seed, so
+that the measurements are comparable across runs. It is committed to
+a Git repository (when available), as the theme looks up the date of
+the last commit of every page.
+"""
+
+from __future__ import annotations
+
+import os
+import os.path as p
+import random
+import shutil
+import struct
+import subprocess
+import typing as t
+import zlib
+
+if t.TYPE_CHECKING:
+    from pathlib import Path
+
+fanout: t.Final[int] = 6
+words: t.Sequence[str] = (
+    "array",
+    "build",
+    "compiler",
+    "container",
+    "docker",
+    "gradient",
+    "kernel",
+    "layer",
+    "memory",
+    "network",
+    "python",
+    "sphinx",
+    "tensor",
+    "theme",
+    "vector",
+)
+conf: t.Final[str] = """\
+project = "Benchmark"
+author = "Akshay Mestry"
+html_theme = "kaamiki"
+html_context = {
+    "fa_icons": {
+        "breadcrumb_home": "fa-regular fa-house",
+        "breadcrumb_separator_child": "fa-solid fa-angle-right",
+        "breadcrumb_separator_parent": "fa-solid fa-angles-right",
+        "dark_mode": "fa-solid fa-moon-star",
+        "light_mode": "fa-solid fa-sun-bright",
+        "next_button": "fa-solid fa-arrow-right",
+        "previous_button": "fa-solid fa-arrow-left",
+    },
+    "favicons": {
+        "manifest": "site.webmanifest",
+        "size_16": "favicon-16x16.png",
+        "size_32": "favicon-32x32.png",
+        "size_180": "apple-touch-icon.png",
+    },
+    "project": {
+        "author": author,
+        "email": "xa@mes3.dev",
+        "source": "https://github.com/xames3/website",
+    },
+    "show_breadcrumbs": True,
+    "show_last_updated_on": True,
+    "show_previous_next_pages": True,
+    "show_toctree": True,
+}
+ogp_social_cards = {"enable": False}
+"""
+
+
+def png(colour: tuple[int, int, int], size: int = 16) -> bytes:
+    """Return a solid colour PNG image."""
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        """Pack a PNG chunk with its length and checksum."""
+        crc = struct.pack(">I", zlib.crc32(kind + data))
+        return struct.pack(">I", len(data)) + kind + data + crc
+
+    row = b"\x00" + bytes(colour) * size
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", header),
+            chunk(b"IDAT", zlib.compress(row * size)),
+            chunk(b"IEND", b""),
+        )
+    )
+
+
+def docname(index: int) -> str:
+    """Return the document name of a page, nested by its depth."""
+    depth = 0
+    parent = index
+    while parent:
+        parent = (parent - 1) // fanout
+        depth += 1
+    return "index" if not index else f"{'/'.join(['part'] * depth)}/{index}"
+
+
+def sentence(rng: random.Random, size: int = 14) -> str:
+    """Return a sentence of random words."""
+    text = " ".join(rng.choice(words) for _ in range(size))
+    return f"{text.capitalize()}."
+
+
+def page(index: int, pages: int, rng: random.Random) -> str:
+    """Return the reStructuredText source of a page.
+
+    :param index: Index of the page in the tree.
+    :param pages: Total number of pages in the project.
+    :param rng: Random number generator seeded for the corpus.
+    :return: Source of the page.
+    """
+    name = docname(index)
+    title = f"Page {index}: {rng.choice(words).capitalize()}"
+    assets = p.relpath("_assets", p.dirname(name) or ".")
+    children = [
+        docname(child)
+        for child in range(index * fanout + 1, index * fanout + fanout + 1)
+        if child < pages
+    ]
+    lines = [title, "=" * len(title), ""]
+    lines += [
+        ".. author::",
+        "    :name: Akshay Mestry",
+        "    :avatar: https://avatars.githubusercontent.com/u/90549089",
+        "    :github: https://github.com/xames3",
+        f"    :timestamp: Oct {index % 28 + 1:02d}, 2026",
+        "",
+    ]
+    for section in range(3):
+        heading = f"Section {index}.{section}"
+        lines += [heading, "-" * len(heading), ""]
+        for _ in range(3):
+            lines += [sentence(rng), ""]
+        lines += [
+            (
+                "Some :stylise:`styled text <color: red;>` and an "
+                f":email:`email <xa@mes3.dev>` in section {section}."
+            ),
+            "",
+            ".. code-block:: python",
+            "",
+            f"    def section_{section}(x: int) -> int:",
+            "        return x * 2",
+            "",
+        ]
+        subheading = f"Subsection {index}.{section}.1"
+        lines += [subheading, "~" * len(subheading), "", sentence(rng), ""]
+    if children:
+        lines += [".. toctree::", "    :maxdepth: 2", ""]
+        lines += [f"    /{child}" for child in children]
+        lines += [""]
+    if index % 3 == 0:
+        lines += [
+            ".. picture::",
+            f"    :light: {assets}/light.png",
+            f"    :dark: {assets}/dark.png",
+            f"    :alt: Picture on page {index}",
+            "",
+        ]
+    if index % 4 == 0:
+        lines += [".. repository:: xames3/xa", "    :stars:", ""]
+    if index % 5 == 0:
+        lines += [
+            ".. youtube:: https://www.youtube.com/watch?v=PhabJpIPONI",
+            "",
+        ]
+    if index % 7 == 0:
+        lines += [
+            ".. thumbnail:: https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "",
+        ]
+    if index % 11 == 0:
+        lines += [".. video:: https://www.w3schools.com/tags/movie.mp4", ""]
+    return "\n".join(lines)
+
+
+def generate(root: Path, pages: int, seed: int = 0) -> Path:
+    """Generate a synthetic Sphinx project.
+
+    :param root: Directory to write the project to.
+    :param pages: Number of pages to generate.
+    :param seed: Seed for the random prose.
+    :return: Source directory of the project.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    source = root / "source"
+    (source / "_assets").mkdir(parents=True, exist_ok=True)
+    (source / "conf.py").write_text(conf, encoding="utf-8")
+    (source / "_assets" / "light.png").write_bytes(png((250, 250, 250)))
+    (source / "_assets" / "dark.png").write_bytes(png((20, 20, 20)))
+    for index in range(pages):
+        path = source / f"{docname(index)}.rst"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(page(index, pages, rng), encoding="utf-8")
+    commit(root)
+    return source
+
+
+def commit(root: Path) -> None:
+    """Commit the project to a Git repository, if Git is available.
+
+    The theme looks up the last commit date of every page, hence the
+    corpus is versioned like a real project would be.
+    """
+    git = shutil.which("git")
+    if not git:
+        return
+    env = {
+        "GIT_AUTHOR_NAME": "Benchmark",
+        "GIT_AUTHOR_EMAIL": "benchmark@localhost",
+        "GIT_AUTHOR_DATE": "2026-10-19T00:00:00Z",
+        "GIT_COMMITTER_NAME": "Benchmark",
+        "GIT_COMMITTER_EMAIL": "benchmark@localhost",
+        "GIT_COMMITTER_DATE": "2026-10-19T00:00:00Z",
+        "PATH": os.environ.get("PATH", ""),
+    }
+    for args in (["init", "-q"], ["add", "-A"], ["commit", "-qm", "corpus"]):
+        subprocess.run([git, *args], cwd=root, env=env, check=True)  # noqa: S603
@@ -0,0 +1,171 @@
+"""\
+Cache Headers
+=============
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module checks the `_headers` manifest written by the theme by
+serving the output through a stand-in for the static host::
+
+    python -m benchmarks.headers --pages 20
+
+It generates a corpus (see `corpus`), builds it with `cache_headers`
+enabled, and serves the output with a handler applying the rules the
+way Netlify and Cloudflare Pages do, i.e., every rule whose path
+matches adds its headers to the response. Every file of the output is
+then requested, and the run exits with a non-zero status if::
+
+    [1] A response doesn't carry exactly one `Cache-Control` header.
+    [2] A page isn't revalidated, or doesn't carry the `Link` headers.
+    [3] A file referenced with a `?v=` checksum isn't `immutable`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import functools
+import http.server
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import typing as t
+import urllib.request
+from pathlib import Path
+
+from benchmarks import corpus
+from theme.extensions import headers
+
+Rule = tuple[re.Pattern[str], list[tuple[str, str]]]
+
+
+def parse(text: str) -> list[Rule]:
+    """Parse the rules of a `_headers` file.
+
+    :param text: Contents of the file.
+    :return: The paths, as patterns, and their headers.
+    """
+    rules: list[Rule] = []
+    for line in text.splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if not line[0].isspace():
+            pattern = re.escape(line.strip()).replace(r"\*", ".*")
+            rules.append((re.compile(pattern), []))
+        else:
+            header, value = line.strip().split(":", 1)
+            rules[-1][1].append((header.strip(), value.strip()))
+    return rules
+
+
+class handler(http.server.SimpleHTTPRequestHandler):
+    """Serve the output with the headers of the matching rules."""
+
+    rules: t.ClassVar[list[Rule]] = []
+
+    def end_headers(self) -> None:
+        """Add the headers of every rule matching the path."""
+        path = self.path.split("?", 1)[0]
+        for pattern, pairs in self.rules:
+            if pattern.fullmatch(path):
+                for header, value in pairs:
+                    self.send_header(header, value)
+        super().end_headers()
+
+    def log_message(self, *_: t.Any) -> None:
+        """Keep the requests out of the report."""
+
+
+def build(source: Path, outdir: Path) -> None:
+    """Build the project with the manifests enabled.
+
+    :param source: Source directory of the project.
+    :param outdir: Directory to write the output to.
+    """
+    subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "sphinx",
+            "--builder",
+            "html",
+            "--quiet",
+            "--html-define",
+            "cache_headers=1",
+            str(source),
+            str(outdir),
+        ],
+        check=True,
+    )
+
+
+def check(outdir: Path, url: str) -> list[str]:
+    """Request every file of the output and return the problems found.
+
+    :param outdir: The output directory being served.
+    :param url: URL of the stand-in server.
+    :return: The problems, one per file.
+    """
+    paths = headers.files(outdir)
+    pages = [path for path in paths if path.endswith(".html")]
+    fingerprinted = headers.versioned(outdir, pages)
+    problems: list[str] = []
+    policies: collections.Counter[str] = collections.Counter()
+    for path in paths:
+        with urllib.request.urlopen(url + path) as resp:  # noqa: S310
+            resp.read()
+            controls = resp.headers.get_all("Cache-Control") or []
+            links = resp.headers.get_all("Link") or []
+        if len(controls) != 1:
+            problems.append(f"{path}: {len(controls)} Cache-Control headers")
+            continue
+        policies[controls[0]] += 1
+        if path.endswith(".html") and (
+            controls[0] != headers.revalidate or not links
+        ):
+            problems.append(f"{path}: page served with {controls[0]!r}")
+        if path in fingerprinted and controls[0] != headers.immutable:
+            problems.append(f"{path}: versioned file not immutable")
+    for policy, count in policies.most_common():
+        print(f"{count:6d} files: {policy}")
+    return problems
+
+
+def main() -> int:
+    """Build, serve, and check the corpus and return the exit status."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.headers",
+        description="Check the cache headers manifest of the theme.",
+    )
+    parser.add_argument("--pages", type=int, default=20)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="kaamiki-headers-") as tmp:
+        workdir = Path(tmp)
+        source = corpus.generate(workdir, args.pages)
+        outdir = workdir / "html"
+        build(source, outdir)
+        manifest = outdir / headers.name
+        handler.rules = parse(manifest.read_text(encoding="utf-8"))
+        print(f"{len(handler.rules)} rules in {headers.name}")
+        server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0),
+            functools.partial(handler, directory=os.fspath(outdir)),
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            host, port = server.server_address[:2]
+            problems = check(outdir, f"http://{host}:{port}/")
+        finally:
+            server.shutdown()
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
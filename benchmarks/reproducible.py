@@ -0,0 +1,114 @@
+"""\
+Reproducible Builds
+===================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module checks that the same sources produce the same output,
+byte for byte, so that unchanged pages keep their ETags and aren't
+uploaded again on deploys::
+
+    python -m benchmarks.reproducible --pages 50
+
+It generates a corpus (see `corpus`), builds it twice from scratch
+with `SOURCE_DATE_EPOCH` set, each in its own interpreter with a
+different hash seed, and compares the two outputs. The run exits with
+a non-zero status listing the files that differ, if any.
+
+.. note::
+
+    The doctrees are not compared, as they are pickles holding the
+    absolute paths of the build.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import typing as t
+from pathlib import Path
+
+from benchmarks import corpus
+
+epoch: t.Final[str] = "1792368000"
+
+
+def build(source: Path, outdir: Path, seed: int) -> None:
+    """Build the project from scratch in a fresh interpreter.
+
+    :param source: Source directory of the project.
+    :param outdir: Directory to write the output to.
+    :param seed: Hash seed of the interpreter.
+    """
+    env = {
+        **os.environ,
+        "PYTHONHASHSEED": str(seed),
+        "SOURCE_DATE_EPOCH": epoch,
+    }
+    subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "sphinx",
+            "--builder",
+            "html",
+            "--quiet",
+            "--doctree-dir",
+            str(outdir.with_suffix(".doctrees")),
+            str(source),
+            str(outdir),
+        ],
+        env=env,
+        check=True,
+    )
+
+
+def differences(first: Path, second: Path) -> list[str]:
+    """Return the files which differ between two output directories.
+
+    :param first: The first output directory.
+    :param second: The second output directory.
+    :return: Paths relative to the output directories, sorted.
+    """
+    files = {
+        path.relative_to(root).as_posix()
+        for root in (first, second)
+        for path in root.rglob("*")
+        if path.is_file()
+    }
+    return sorted(
+        name
+        for name in files
+        if not (first / name).is_file()
+        or not (second / name).is_file()
+        or (first / name).read_bytes() != (second / name).read_bytes()
+    )
+
+
+def main() -> int:
+    """Build the corpus twice and return the exit status."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.reproducible",
+        description="Check that the theme's output is reproducible.",
+    )
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="kaamiki-repro-") as tmp:
+        workdir = Path(tmp)
+        source = corpus.generate(workdir, args.pages)
+        build(source, workdir / "first", seed=1)
+        build(source, workdir / "second", seed=2)
+        differing = differences(workdir / "first", workdir / "second")
+    for name in differing:
+        print(f"differs: {name}", file=sys.stderr)
+    print(f"{len(differing)} files differ between the builds")
+    return 1 if differing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""\
+Stage Measurements
+==================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module builds a synthetic corpus and measures the theme's stages.
+
+The build runs with the theme's build tracing enabled, which accounts
+for the time spent in the directives within the build. The remaining
+stages are then timed in isolation against the same project, using
+the pages as they were before the theme post-processed them.
+
+All durations are in seconds, taking the best of the repeated runs
+for the isolated stages.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import pickle
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import typing as t
+from pathlib import Path
+
+import bs4
+from sphinx.application import Sphinx
+
+from benchmarks import corpus
+from theme.extensions import tracing
+from theme.extensions import utils
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable
+
+directives: t.Sequence[str] = (
+    "author",
+    "picture",
+    "repository",
+    "thumbnail",
+    "video",
+    "youtube",
+)
+
+
+def best(fn: Callable[[], float], repeat: int) -> float:
+    """Return the smallest duration of the repeated runs."""
+    return min(fn() for _ in range(repeat))
+
+
+def peak_memory() -> float:
+    """Return the peak resident memory of this process in MiB."""
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def build(source: Path, workdir: Path, jobs: int) -> tuple[Sphinx, float]:
+    """Build the project from scratch with tracing enabled.
+
+    The generated pages are snapshot before the theme post-processes
+    them, so that the isolated stages work with the same input.
+
+    :param source: Source directory of the project.
+    :param workdir: Directory for the output and the snapshot.
+    :param jobs: Number of parallel jobs.
+    :return: A tuple of the application and the build duration.
+    """
+    outdir = workdir / "html"
+    snapshot = workdir / "snapshot"
+
+    def save(app: Sphinx, exc: Exception | None) -> None:
+        """Copy the pages before the theme post-processes them."""
+        if not exc:
+            shutil.copytree(app.outdir, snapshot, dirs_exist_ok=True)
+
+    os.environ[tracing.variable] = "1"
+    start = time.perf_counter()
+    app = Sphinx(
+        source,
+        source,
+        outdir,
+        workdir / "doctrees",
+        "html",
+        status=None,
+        warning=io.StringIO(),
+        freshenv=True,
+        parallel=jobs,
+    )
+    app.connect("build-finished", save, priority=100)
+    app.build(force_all=True)
+    return app, time.perf_counter() - start
+
+
+def time_postprocess(app: Sphinx, pages: list[Path], workdir: Path) -> float:
+    """Time `postprocess` on copies of the snapshot pages."""
+    copies = workdir / "postprocess"
+    shutil.rmtree(copies, ignore_errors=True)
+    copies.mkdir()
+    targets = []
+    for index, page in enumerate(pages):
+        target = copies / f"{index}.html"
+        shutil.copyfile(page, target)
+        targets.append(str(target))
+    start = time.perf_counter()
+    for target in targets:
+        utils.postprocess(target, app)
+    return time.perf_counter() - start
+
+
+def time_make_toc_collapsible(pages: list[Path]) -> float:
+    """Time `make_toc_collapsible` on freshly parsed pages."""
+    total = 0.0
+    for page in pages:
+        tree = bs4.BeautifulSoup(page.read_text("utf-8"), "html.parser")
+        start = time.perf_counter()
+        utils.make_toc_collapsible(tree)
+        total += time.perf_counter() - start
+    return total
+
+
+def time_last_updated_date(app: Sphinx) -> float:
+    """Time `last_updated_date` for every document of the project."""
+    sources = {
+        docname: [Path(app.env.doc2path(docname)).read_text("utf-8")]
+        for docname in app.env.found_docs
+    }
+    for docname in sources:
+        app.env.metadata.setdefault(docname, {}).pop("last_updated", None)
+    start = time.perf_counter()
+    for docname, source in sources.items():
+        utils.last_updated_date(app, docname, source)
+    return time.perf_counter() - start
+
+
+def time_directives(doctreedir: Path) -> float:
+    """Sum the traced time of the directives within the build."""
+    summary = json.loads((doctreedir / "trace" / "summary.json").read_text())
+    return sum(
+        entry["total"] / 1000
+        for entry in summary
+        if entry["name"].split(".", 1)[0] in directives
+    )
+
+
+def doctree_size(doctreedir: Path) -> float:
+    """Return the average size of the pickled doctrees in KiB."""
+    doctrees = list(doctreedir.rglob("*.doctree"))
+    return sum(_.stat().st_size for _ in doctrees) / len(doctrees) / 1024
+
+
+def time_env_load(doctreedir: Path) -> float:
+    """Time unpickling the environment, as an incremental build would."""
+    data = (doctreedir / "environment.pickle").read_bytes()
+    start = time.perf_counter()
+    pickle.loads(data)  # noqa: S301
+    return time.perf_counter() - start
+
+
+def measure(pages: int, jobs: int = 1, repeat: int = 3) -> dict[str, float]:
+    """Generate a project of the given size and measure the stages.
+
+    This is meant to run in a fresh interpreter, so that the peak
+    memory is of the build alone.
+
+    :param pages: Number of pages in the project.
+    :param jobs: Number of parallel jobs for the build.
+    :param repeat: Number of runs of the isolated stages.
+    :return: Mapping of the metric names and their values.
+    """
+    with tempfile.TemporaryDirectory(prefix="kaamiki-bench-") as tmp:
+        workdir = Path(tmp)
+        source = corpus.generate(workdir, pages)
+        app, duration = build(source, workdir, jobs)
+        memory = peak_memory()
+        snapshot = sorted((workdir / "snapshot").rglob("*.html"))
+        html = sorted((workdir / "html").rglob("*.html"))
+        return {
+            "build": duration,
+            "peak_memory_mib": memory,
+            "page_kib": sum(_.stat().st_size for _ in html) / len(html) / 1024,
+            "directives": time_directives(workdir / "doctrees"),
+            "doctree_kib": doctree_size(workdir / "doctrees"),
+            "env_load": best(
+                lambda: time_env_load(workdir / "doctrees"), repeat
+            ),
+            "postprocess": best(
+                lambda: time_postprocess(app, snapshot, workdir), repeat
+            ),
+            "make_toc_collapsible": best(
+                lambda: time_make_toc_collapsible(snapshot), repeat
+            ),
+            "last_updated_date": best(
+                lambda: time_last_updated_date(app), repeat
+            ),
+        }
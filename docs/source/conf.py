@@ -108,6 +108,7 @@ html_title: str = "amestry"
 html_baseurl: t.Final[str] = "https://xa.mes3.dev/"
 html_context: dict[str, t.Any] = {
     "add_copy_to_headerlinks": True,
+    "content_visibility": True,
     "fa_icons": {
         "breadcrumb_home": "fa-regular fa-house",
         "breadcrumb_separator_child": "fa-solid fa-angle-right",
@@ -134,7 +135,11 @@ html_context: dict[str, t.Any] = {
             ),
         },
     },
+    "inline_assets_threshold": 2048,
+    "minify_html": True,
     "open_links_in_new_tab": True,
+    "optimise_images": True,
+    "prefetch_pages": True,
     "project": {
         "author": author,
         "source": source,
@@ -163,6 +168,23 @@ html_context: dict[str, t.Any] = {
             "icon": Markup('<i class="far fa-heart"></i>'),
         },
     },
+    "subset_fonts": True,
+    "third_party_scripts": [
+        {
+            "src": "https://gc.zgo.at/count.js",
+            "load": "idle",
+            "attributes": {
+                "data-goatcounter": "https://xa.goatcounter.com/count",
+            },
+        },
+        {
+            "src": "https://app.cal.com/embed/embed.js",
+            "load": "interaction",
+            "trigger": "[data-cal-link]",
+            "setup": "cal",
+            "ui": {"hideEventTypeDetails": False, "layout": "month_view"},
+        },
+    ],
 }
 html_favicon: t.Final[str] = "_static/favicons/favicon.ico"
 html_static_path: list[str] = ["_static"]
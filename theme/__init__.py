@@ -4,7 +4,7 @@ Akshay's Corner Sphinx Theme
 
 Author: Akshay Mestry <xa@mes3.dev>
 Created on: 21 February, 2025
-Last updated on: 14 February, 2026
+Last updated on: 19 October, 2026
 
 This module serves as the primary entry point for the Akshay's Corner
 Sphinx Theme. It is responsible for initialising the theme, configuring
@@ -55,6 +55,53 @@ hooks for post-processing and dynamic content handling.
 
     [1] This theme now has a name, `Kaamiki`.
     [2] Officially dropped support for `DocSearch`.
+
+.. versionadded:: 19.10.2026
+
+    [1] Added an opt-in, build-versioned service worker for offline
+        support and faster repeat visits.
+    [2] Added support for self-hosting a subset of Font Awesome instead
+        of loading the kit script.
+    [3] Added support for self-hosting subsets of the Geist faces along
+        with preloading the critical ones.
+    [4] Added opt-in build tracing of the theme's event handlers,
+        directives, roles, and node visitors.
+    [5] The doctree-level fix-ups now run as a single post-transform
+        instead of separate passes over the document.
+    [6] The embed directives (`repository`, `thumbnail`, `video`, and
+        `youtube`) now render while writing the pages. The theme also
+        declares an `env_version`, so that the environments pickled
+        with the previous doctrees are read afresh.
+    [7] The `author` nodes no longer carry a copy of the `html_context`
+        in the pickled doctrees.
+    [8] The directives render through a shared cache, which persists
+        across incremental builds.
+    [9] Added a live-reloading development server, `python -m theme
+        serve`, and the post-processing now covers every page written
+        by the build.
+    [10] The documents whose contents haven't changed are not read
+         again, even if their modification times have.
+    [11] The pages are reproducible, the same sources (and the same
+         `SOURCE_DATE_EPOCH`) produce the same bytes.
+    [12] Added opt-in minification of the pages to the post-processing.
+    [13] The scripts of the components only some pages have are split
+         into modules, which are imported only by the pages using them.
+    [14] The third-party scripts are declared in `html_context` as
+         `third_party_scripts` and loaded when the browser is idle, or
+         on the first interaction with the elements which need them.
+    [15] Every page gets the `preconnect`, `dns-prefetch`, and `preload`
+         hints for the origins and the assets it's known to need.
+    [16] Added opt-in `_headers` and nginx manifests describing the
+         caching policy of every file in the output.
+    [17] The images of every page are given their intrinsic dimensions
+         and are loaded lazily, except for the first one of the article.
+    [18] Added opt-in lossless recompression of the images copied to
+         the output.
+    [19] Added opt-in inlining of the small images as data URIs.
+    [20] The sections of long articles can be rendered on demand, with
+         their components set up as they approach the viewport.
+    [21] Videos can be loaded lazily, and the autoplaying ones are
+         paused and released when scrolled away.
 """
 
 from __future__ import annotations
@@ -71,11 +118,23 @@ from sphinx.util import logging
 from sphinx.util.fileutil import copy_asset
 from sphinx.util.matching import DOTFILES
 
+from theme.extensions import cache
 from theme.extensions import directives
+from theme.extensions import features
+from theme.extensions import fonts
+from theme.extensions import headers
+from theme.extensions import icons
+from theme.extensions import images
+from theme.extensions import inline
+from theme.extensions import optimise
 from theme.extensions import roles
+from theme.extensions import sections
+from theme.extensions import serviceworker
+from theme.extensions import sources
+from theme.extensions import tracing
+from theme.extensions import transforms
+from theme.extensions import utils
 from theme.extensions.utils import build_finished
-from theme.extensions.utils import ensure_classes_on_nodes
-from theme.extensions.utils import env_before_read_docs
 from theme.extensions.utils import last_updated_date
 
 if t.TYPE_CHECKING:
@@ -87,6 +146,7 @@ if t.TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 version: str = "14.02.2026"
+env_version: t.Final[int] = 2
 theme_name: t.Final[str] = "kaamiki"
 theme_path = p.join(p.abspath(p.dirname(__file__)), "base", "templates")
 supported_extensions: t.Sequence[str] = (
@@ -126,7 +186,21 @@ def copy_theme_static_files(
     )
 
 
-StandaloneHTMLBuilder.copy_theme_static_files = copy_theme_static_files
+StandaloneHTMLBuilder.copy_theme_static_files = tracing.traced(
+    copy_theme_static_files, "static"
+)
+tracing.instrument(
+    utils,
+    "add_copy_to_headerlinks",
+    "collapse_whitespace",
+    "make_toc_collapsible",
+    "open_links_in_new_tab",
+    "postprocess",
+    "remove_comments",
+    "remove_empty_toctree_divs",
+)
+tracing.instrument(images, "annotate")
+tracing.instrument(sections, "defer")
 
 
 def fix(module: types.ModuleType) -> type[nodes.Element]:
@@ -148,7 +222,7 @@ def fix(module: types.ModuleType) -> type[nodes.Element]:
     return node
 
 
-def setup(app: Sphinx) -> dict[str, str | bool]:
+def setup(app: Sphinx) -> dict[str, str | bool | int]:
     """Initialise and configure the sphinx theme.
 
     This function serves as the main entry point for integrating the
@@ -165,7 +239,8 @@ def setup(app: Sphinx) -> dict[str, str | bool]:
             toctrees.
 
     :param app: The Sphinx application instance.
-    :return: A dictionary indicating the theme's version and its
+    :return: A dictionary indicating the theme's version, the version
+        of the doctrees it stores in the environment, and its
         compatibility with parallel read and write processes.
 
     .. deprecated:: 19.10.2025
@@ -184,19 +259,50 @@ def setup(app: Sphinx) -> dict[str, str | bool]:
     app.add_css_file("sphinx-design.css", priority=800)
     app.add_js_file("base.js", loading_method="defer")
     app.add_js_file("theme.js", loading_method="defer")
-    for role in inspect.getmembers(roles, inspect.isfunction):
-        rst.roles.register_local_role(*role)
+    for name, role in inspect.getmembers(roles, inspect.isfunction):
+        rst.roles.register_local_role(name, tracing.traced(role, "role"))
     for directive in directives:
-        app.add_node(fix(directive), html=(directive.visit, directive.depart))
-        app.add_directive(directive.name, directive.directive)
+        app.add_node(
+            fix(directive),
+            html=(
+                tracing.traced(directive.visit, "visit"),
+                tracing.traced(directive.depart, "depart"),
+            ),
+        )
+        app.add_directive(
+            directive.name, tracing.traced_run(directive.directive, "directive")
+        )
         if hasattr(directive, "html_page_context"):
-            app.connect("html-page-context", directive.html_page_context)
-    app.connect("env-before-read-docs", env_before_read_docs)
-    app.connect("source-read", last_updated_date)
-    app.connect("doctree-resolved", ensure_classes_on_nodes)
-    app.connect("build-finished", build_finished)
+            app.connect(
+                "html-page-context",
+                tracing.traced(directive.html_page_context, "event"),
+            )
+    for event, handler, priority in (
+        ("builder-inited", cache.builder_inited, 500),
+        ("builder-inited", fonts.builder_inited, 500),
+        ("env-get-outdated", fonts.env_get_outdated, 500),
+        ("env-before-read-docs", sources.env_before_read_docs, 500),
+        ("env-updated", sources.env_updated, 500),
+        ("source-read", last_updated_date, 500),
+        ("html-page-context", features.html_page_context, 500),
+        ("build-finished", build_finished, 500),
+        ("build-finished", icons.build_finished, 600),
+        ("build-finished", fonts.build_finished, 700),
+        ("build-finished", optimise.build_finished, 750),
+        ("build-finished", inline.build_finished, 775),
+        ("build-finished", serviceworker.build_finished, 800),
+        ("build-finished", cache.build_finished, 850),
+        ("build-finished", headers.build_finished, 860),
+    ):
+        app.connect(event, tracing.traced(handler, "event"), priority)
+    app.add_post_transform(
+        tracing.traced_run(transforms.transform, "transform")
+    )
+    app.connect("builder-inited", tracing.builder_inited, priority=100)
+    app.connect("build-finished", tracing.build_finished, priority=900)
     return {
         "version": version,
+        "env_version": env_version,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
@@ -0,0 +1,347 @@
+"""\
+Theme Development Server
+========================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module provides a live-reloading development server for writing
+the documentation with this theme::
+
+    python -m theme serve docs/source --port 5500
+
+The server builds the project once, serves the output, and watches the
+source directory along with the theme's `base` directory for changes.
+Changes are debounced, i.e., a burst of saves results in one rebuild,
+after which the open pages are reloaded using server-sent events.
+
+The rebuilds run in the same (in-process) Sphinx application, so only
+the affected documents are read and written again, only the written
+pages are post-processed, and only the changed static assets are
+copied. The application is created anew if the `conf.py` changes.
+
+.. note::
+
+    The Geist faces are not subset while serving, as that rescans
+    every page of the output on every rebuild. The pages use the
+    hosted faces instead. The service worker is disabled as well, as
+    it would serve the stale pages (and the reload events) from its
+    caches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import http.server
+import os
+import queue
+import sys
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+import jinja2
+from sphinx.application import Sphinx
+from sphinx.util.docutils import docutils_namespace
+from sphinx.util.docutils import patch_docutils
+
+from theme.extensions import cache
+from theme.extensions import directives
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+endpoint: t.Final[str] = "/_kaamiki/reload"
+
+# NOTE: These are applied while the configuration is read, so that the
+# handlers of `builder-inited` already see them.
+overrides: t.Final[dict[str, t.Any]] = {
+    "html_context.subset_fonts": False,
+    "html_context.service_worker": False,
+}
+script: t.Final[bytes] = (
+    b"<script>new EventSource('/_kaamiki/reload')"
+    b".onmessage = () => location.reload();</script>"
+)
+interval: t.Final[float] = 0.25
+base = Path(__file__).resolve().parent / "base"
+
+clients: list[queue.SimpleQueue[str]] = []
+lock = threading.Lock()
+
+
+def broadcast(message: str = "reload") -> None:
+    """Send a message to every open page."""
+    with lock:
+        for client in clients:
+            client.put(message)
+
+
+class handler(http.server.SimpleHTTPRequestHandler):
+    """Serve the built pages along with the reload events.
+
+    The pages are served with a small script, which reloads the page
+    when the server sends an event after a rebuild. The output itself
+    is left untouched.
+    """
+
+    def do_GET(self) -> None:
+        """Serve the reload events, a page, or any other file."""
+        if self.path == endpoint:
+            self.events()
+            return
+        path = Path(self.translate_path(self.path))
+        if path.is_dir() and self.path.split("?", 1)[0].endswith("/"):
+            path /= "index.html"
+        if path.suffix == ".html" and path.is_file():
+            self.page(path)
+            return
+        super().do_GET()
+
+    def page(self, path: Path) -> None:
+        """Serve a page with the reload script."""
+        body = path.read_bytes().replace(b"</body>", script + b"</body>", 1)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def events(self) -> None:
+        """Stream the reload events until the page is closed.
+
+        A comment is sent periodically to find out if the connection is
+        still open.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        client: queue.SimpleQueue[str] = queue.SimpleQueue()
+        with lock:
+            clients.append(client)
+        try:
+            while True:
+                try:
+                    message = f"data: {client.get(timeout=15)}\n\n"
+                except queue.Empty:
+                    message = ": ping\n\n"
+                self.wfile.write(message.encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with lock:
+                clients.remove(client)
+
+    def log_message(self, *_: t.Any) -> None:
+        """Keep the requests out of the build's output."""
+
+
+def snapshot(paths: Iterable[Path], excluded: set[Path]) -> dict[Path, int]:
+    """Return the modification times of the files under the paths.
+
+    :param paths: Directories to scan.
+    :param excluded: Directories to skip, e.g., the output directory.
+    :return: Mapping of the files and their modification times.
+    """
+    files: dict[Path, int] = {}
+    for path in paths:
+        for root, dirnames, filenames in os.walk(path):
+            dirnames[:] = [
+                dirname
+                for dirname in dirnames
+                if not dirname.startswith(".")
+                and dirname != "__pycache__"
+                and Path(root, dirname).resolve() not in excluded
+            ]
+            for filename in filenames:
+                if filename.startswith("."):
+                    continue
+                file = Path(root, filename)
+                try:
+                    files[file] = file.stat().st_mtime_ns
+                except FileNotFoundError:
+                    continue
+    return files
+
+
+def changes(before: dict[Path, int], after: dict[Path, int]) -> set[Path]:
+    """Return the files added, modified, or removed between snapshots."""
+    return {
+        path
+        for path in before.keys() | after.keys()
+        if before.get(path) != after.get(path)
+    }
+
+
+def watch(
+    paths: Iterable[Path],
+    excluded: set[Path],
+    delay: float,
+) -> Iterator[set[Path]]:
+    """Yield the changed files, once they have settled.
+
+    The directories are polled, and a change is only reported after
+    nothing else has changed for `delay` seconds.
+
+    :param paths: Directories to watch.
+    :param excluded: Directories to skip, e.g., the output directory.
+    :param delay: Debounce delay in seconds.
+    :yield: Files changed since the previous report.
+    """
+    paths = list(paths)
+    state = snapshot(paths, excluded)
+    while True:
+        time.sleep(interval)
+        current = snapshot(paths, excluded)
+        changed = changes(state, current)
+        if not changed:
+            continue
+        while True:
+            time.sleep(delay)
+            latest = snapshot(paths, excluded)
+            settled = changes(current, latest)
+            if not settled:
+                break
+            changed |= settled
+            current = latest
+        state = current
+        yield changed
+
+
+def reload_templates(changed: set[Path]) -> bool:
+    """Reload the directives' templates which have changed.
+
+    The directives' templates are loaded once on import, unlike the
+    theme's templates which Sphinx reloads on its own. Sphinx doesn't
+    consider them when looking for the outdated pages either, hence
+    the pages have to be written again if any of them changed.
+
+    :param changed: Files changed since the previous build.
+    :return: `True` if any of the templates were reloaded.
+    """
+    reloaded = False
+    for directive in directives:
+        html = Path(directive.html).resolve()
+        if html in changed and html.is_file():
+            directive.template = jinja2.Template(html.read_text())
+            reloaded = True
+    if reloaded:
+        cache.entries.clear()
+    return reloaded
+
+
+def application(source: Path, outdir: Path, jobs: int) -> Sphinx:
+    """Create the Sphinx application for serving the project.
+
+    :param source: Source directory of the project.
+    :param outdir: Directory to write the output to.
+    :param jobs: Number of parallel jobs.
+    :return: The Sphinx application instance.
+    """
+    return Sphinx(
+        source,
+        source,
+        outdir,
+        outdir / ".doctrees",
+        "html",
+        confoverrides=overrides,
+        parallel=jobs,
+    )
+
+
+def build(app: Sphinx, *, force_all: bool = False) -> bool:
+    """Build the project, reporting rather than raising any errors.
+
+    :param app: The Sphinx application instance.
+    :param force_all: Whether to write every page, rather than only
+        the outdated ones.
+    :return: `True` if the build succeeded, `False` otherwise.
+    """
+    try:
+        app.build(force_all=force_all)
+    except Exception as exc:
+        print(f"Build failed: {exc!r}", file=sys.stderr)
+        return False
+    return True
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Serve the project and rebuild it on changes.
+
+    :param args: Parsed command-line arguments.
+    :return: Exit status.
+    """
+    source: Path = args.source.resolve()
+    outdir: Path = (args.outdir or source.parent / "build").resolve()
+    conf = source / "conf.py"
+    server = http.server.ThreadingHTTPServer(
+        (args.host, args.port),
+        functools.partial(handler, directory=str(outdir)),
+    )
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://{args.host}:{args.port}/"
+    try:
+        while True:
+            with patch_docutils(source), docutils_namespace():
+                app = application(source, outdir, args.jobs)
+                build(app)
+                broadcast()
+                print(f"Serving {outdir} at {url}")
+                for changed in watch((source, base), {outdir}, args.delay):
+                    if conf in changed:
+                        break
+                    if build(app, force_all=reload_templates(changed)):
+                        broadcast()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+
+def main() -> int:
+    """Parse the command-line arguments and run the command."""
+    parser = argparse.ArgumentParser(
+        prog="python -m theme",
+        description="Development tools for the kaamiki theme.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser(
+        "serve",
+        help="serve the documentation and rebuild it on changes",
+    )
+    command.add_argument(
+        "source",
+        nargs="?",
+        type=Path,
+        default=Path("docs/source"),
+        help="source directory of the project (default: %(default)s)",
+    )
+    command.add_argument(
+        "--outdir",
+        type=Path,
+        help="output directory (default: the `build` next to the source)",
+    )
+    command.add_argument("--host", default="127.0.0.1")
+    command.add_argument("--port", type=int, default=5500)
+    command.add_argument("--jobs", type=int, default=1)
+    command.add_argument(
+        "--delay",
+        type=float,
+        default=0.3,
+        help="seconds to wait for the changes to settle",
+    )
+    args = parser.parse_args()
+    return serve(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+/**
+ * Hover and keyboard dropdowns for the captions of the header's nav.
+ *
+ * The header outlives instant navigation, so `theme.js` loads this
+ * once, and only if the header has captioned groups to turn into
+ * dropdowns.
+ */
+
+const DROPDOWN_OPEN_DELAY_MS = 40;
+const DROPDOWN_CLOSE_DELAY_MS = 140;
+
+export default function buildHeaderNavDropdowns() {
+    const nav = document.querySelector('.site-header__nav-tree');
+    if (!nav) return;
+    const captions = Array.from(nav.querySelectorAll('p.caption'));
+    if (!captions.length) return;
+
+    let uid = 0;
+    captions.forEach((caption) => {
+        const list = caption.nextElementSibling;
+        if (!list || list.tagName !== 'UL') return;
+
+        const wrapper = document.createElement('div');
+        wrapper.className = 'site-header__nav-group';
+        caption.parentNode.insertBefore(wrapper, caption);
+        wrapper.appendChild(caption);
+        wrapper.appendChild(list);
+
+        const listId = list.id || `nav-group-${++uid}`;
+        list.id = listId;
+        caption.setAttribute('tabindex', '0');
+        caption.setAttribute('role', 'button');
+        caption.setAttribute('aria-haspopup', 'true');
+        caption.setAttribute('aria-controls', listId);
+        caption.setAttribute('aria-expanded', 'false');
+
+        let openTimer = null;
+        let closeTimer = null;
+
+        const open = () => {
+            clearTimeout(closeTimer);
+            openTimer = setTimeout(() => {
+                wrapper.classList.add('is-open');
+                caption.setAttribute('aria-expanded', 'true');
+            }, DROPDOWN_OPEN_DELAY_MS);
+        };
+        const close = () => {
+            clearTimeout(openTimer);
+            closeTimer = setTimeout(() => {
+                wrapper.classList.remove('is-open');
+                caption.setAttribute('aria-expanded', 'false');
+            }, DROPDOWN_CLOSE_DELAY_MS);
+        };
+
+        caption.addEventListener('mouseenter', open, { passive: true });
+        wrapper.addEventListener('mouseenter', open, { passive: true });
+        wrapper.addEventListener('mouseleave', close, { passive: true });
+        caption.addEventListener('focus', open, { passive: true });
+        wrapper.addEventListener('focusout', (e) => {
+            if (!wrapper.contains(e.relatedTarget)) close();
+        });
+
+        caption.addEventListener('keydown', (e) => {
+            if (e.key === 'Enter' || e.key === ' ') {
+                e.preventDefault();
+                wrapper.classList.contains('is-open') ? close() : open();
+            }
+            if (e.key === 'Escape') { close(); caption.blur(); }
+        });
+    });
+}
@@ -0,0 +1,20 @@
+/**
+ * Call `onEnter` once for each node, when it first nears the viewport.
+ *
+ * Falls back to calling it right away for every node in browsers
+ * without `IntersectionObserver`.
+ *
+ * @param {Iterable<Element>} nodes - Elements to observe.
+ * @param {(node: Element) => void} onEnter - Called once per element.
+ */
+export function intersectOnce(nodes, onEnter) {
+    const list = Array.from(nodes);
+    if (!list.length) return;
+    if (!('IntersectionObserver' in window)) { list.forEach(onEnter); return; }
+    const io = new IntersectionObserver((entries) => {
+        for (const e of entries) {
+            if (e.isIntersecting) { io.unobserve(e.target); onEnter(e.target); }
+        }
+    }, { rootMargin: '200px' });
+    list.forEach(n => io.observe(n));
+}
@@ -0,0 +1,90 @@
+/**
+ * Attach the sources of the lazy videos as they near the viewport, and
+ * pause the autoplaying ones once they're scrolled away. Loaded on the
+ * pages with a `video` (see `theme/extensions/video.py`).
+ *
+ * An autoplaying video left offscreen for a while is also released,
+ * i.e., its source is detached so the browser drops its buffers and
+ * stops downloading it, and it resumes where it was when it returns.
+ * A video the reader paused stays paused.
+ */
+
+import { intersectOnce } from './observe.js';
+
+const VIDEO_RELEASE_DELAY_MS = 10000;
+
+const reducedMotion = window.matchMedia('(prefers-reduced-motion: reduce)');
+const released = new WeakMap();
+const timers = new WeakMap();
+
+function attach(video) {
+    const sources = video.querySelectorAll('source[data-src]');
+    if (!sources.length) return;
+    sources.forEach((source) => {
+        source.src = source.dataset.src;
+        source.removeAttribute('data-src');
+    });
+    if (reducedMotion.matches) video.autoplay = false;
+    video.preload = video.autoplay ? 'auto' : 'metadata';
+    video.load();
+}
+
+function release(video) {
+    timers.delete(video);
+    if (!video.paused) return;
+    released.set(video, video.currentTime);
+    video.querySelectorAll('source[src]').forEach((source) => {
+        source.dataset.src = source.getAttribute('src');
+        source.removeAttribute('src');
+    });
+    video.load();
+}
+
+function enter(video) {
+    clearTimeout(timers.get(video));
+    timers.delete(video);
+    if (released.has(video)) {
+        const time = released.get(video);
+        released.delete(video);
+        video.addEventListener('loadedmetadata', () => { video.currentTime = time; }, { once: true });
+    }
+    attach(video);
+    if (video.paused && video.autoplay && video.dataset.userPaused !== '1') {
+        video.play().catch(() => { /* Blocked by the browser; the controls remain. */ });
+    }
+}
+
+function leave(video) {
+    if (!video.paused) {
+        video.dataset.autoPaused = '1';
+        video.pause();
+    }
+    if (video.querySelector('source[src]') && !timers.has(video)) {
+        timers.set(video, setTimeout(() => release(video), VIDEO_RELEASE_DELAY_MS));
+    }
+}
+
+const visibility = 'IntersectionObserver' in window
+    ? new IntersectionObserver((entries) => {
+        for (const entry of entries) {
+            if (entry.isIntersecting) enter(entry.target);
+            else leave(entry.target);
+        }
+    }, { rootMargin: '200px' })
+    : null;
+
+function track(video) {
+    video.dataset.tracked = '1';
+    video.addEventListener('pause', () => {
+        if (video.dataset.autoPaused === '1') delete video.dataset.autoPaused;
+        else if (!released.has(video)) video.dataset.userPaused = '1';
+    });
+    video.addEventListener('play', () => { delete video.dataset.userPaused; });
+    if (visibility) visibility.observe(video);
+    else attach(video);
+}
+
+export default function boot(root, select = (scope, selector) => scope.querySelectorAll(selector)) {
+    intersectOnce(select(root, 'video[data-lazy]:not([data-autoplay])'), attach);
+    select(root, 'video[data-autoplay]:not([data-tracked])').forEach(track);
+}
@@ -0,0 +1,42 @@
+/**
+ * Fill the YouTube cards' title and channel using the oEmbed endpoint,
+ * as the cards scroll into view. Loaded on the pages with a `thumbnail`.
+ * The cards of a deferred section are only observed once it's set up.
+ */
+
+import { intersectOnce } from './observe.js';
+
+const YOUTUBE_FETCH_TIMEOUT_MS = 8000;
+
+async function enrichYouTubeCard(card) {
+    const host = card.matches('[data-youtube-id]') ? card : card.closest('[data-youtube-id]');
+    if (!host || host.dataset.youtubeEnriched === '1') return;
+    const vid = host.getAttribute('data-youtube-id');
+    if (!vid) { host.dataset.youtubeEnriched = '1'; return; }
+
+    const url = 'https://www.youtube.com/oembed?url='
+        + encodeURIComponent('https://www.youtube.com/watch?v=' + vid) + '&format=json';
+
+    const ctrl = new AbortController();
+    const timer = setTimeout(() => ctrl.abort(), YOUTUBE_FETCH_TIMEOUT_MS);
+    try {
+        const res = await fetch(url, { signal: ctrl.signal });
+        if (!res.ok) throw new Error(String(res.status));
+        const data = await res.json();
+        const titleEl = host.querySelector('.site-youtube-card__title');
+        const channelEl = host.querySelector('.site-youtube-card__channel');
+        if (titleEl && data.title) titleEl.textContent = data.title;
+        if (channelEl && data.author_name) channelEl.textContent = data.author_name;
+    } catch {
+        /* Network errors are non-critical; card keeps its fallback text. */
+    } finally {
+        clearTimeout(timer);
+        host.dataset.youtubeEnriched = '1';
+    }
+}
+
+export default function boot(root, select = (scope, selector) => scope.querySelectorAll(selector)) {
+    const cards = select(root,
+        '.site-youtube-card[data-youtube-id], .youtube-card-container[data-youtube-id]');
+    if (cards.length) intersectOnce(cards, enrichYouTubeCard);
+}
@@ -0,0 +1,78 @@
+/**
+ * Hover zoom for the figures and images carrying the `zoom` class.
+ *
+ * Loaded by `theme.js` only on the pages the build recorded as having
+ * such figures (see `theme/extensions/features.py`), and again for
+ * each deferred section, with a `select` that skips the sections not
+ * yet set up.
+ */
+
+function setupZoom(el, wrapperParent) {
+    const isFaceWrap = el.classList && el.classList.contains('face-tag-wrap');
+    const isPicture = el instanceof HTMLPictureElement;
+    const img = isFaceWrap || isPicture ? el.querySelector('img') : el;
+    if (!img || img.classList.contains('no-zoom')) {
+        if (wrapperParent) wrapperParent.dataset.zoomReady = 'true';
+        return;
+    }
+
+    const wrapper = document.createElement('div');
+    wrapper.className = 'zoom-inner';
+    wrapper.style.cssText = 'position:relative;overflow:hidden;border-radius:var(--radius);line-height:0;display:block';
+
+    if (isFaceWrap) {
+        el.style.display = 'block';
+        el.style.lineHeight = '0';
+    } else if (img instanceof HTMLImageElement) {
+        img.style.cssText = 'border-radius:0;display:block;width:100%;height:auto';
+        if (isPicture) el.style.display = 'block';
+    }
+
+    const scale = document.createElement('div');
+    scale.className = 'zoom-scale';
+    scale.style.cssText = 'transform-origin:center;transition:transform var(--duration-slow) var(--ease-in-out);display:block;line-height:0';
+
+    const parent = wrapperParent || el.parentElement;
+    parent.insertBefore(wrapper, el);
+    wrapper.appendChild(scale);
+    scale.appendChild(el);
+
+    wrapper.addEventListener('pointerenter', () => { scale.style.transform = 'scale(1.02)'; }, { passive: true });
+    wrapper.addEventListener('pointerleave', () => { scale.style.transform = 'scale(1)'; }, { passive: true });
+}
+
+export default function initZoom(root, select = (scope, selector) => scope.querySelectorAll(selector)) {
+    if (window.matchMedia('(prefers-reduced-motion: reduce)').matches) return;
+
+    // Figures with .zoom class
+    const figures = select(root, '#content figure.zoom:not([data-zoom-ready]) > :is(img, picture, .face-tag-wrap)');
+    for (const el of figures) {
+        const figure = el.parentElement;
+        if (!figure || figure.dataset.zoomReady === 'true') continue;
+        setupZoom(el, figure);
+        figure.dataset.zoomReady = 'true';
+    }
+
+    // Standalone images with .zoom class
+    const singles = select(root, '#content img.zoom:not(figure img):not(.no-zoom):not([data-zoom-ready])');
+    for (const img of singles) {
+        if (img.dataset.zoomReady === 'true') continue;
+        const wrapper = document.createElement('div');
+        wrapper.className = 'zoom-inner';
+        wrapper.style.cssText = 'position:relative;overflow:hidden;border-radius:var(--radius);line-height:0;display:block;margin:4rem auto';
+
+        img.style.cssText = 'margin:0;border-radius:0;display:block;width:100%;height:auto';
+
+        const scale = document.createElement('div');
+        scale.className = 'zoom-scale';
+        scale.style.cssText = 'transform-origin:center;transition:transform var(--duration-slow) var(--ease-in-out);display:block;line-height:0';
+
+        img.parentElement.insertBefore(wrapper, img);
+        wrapper.appendChild(scale);
+        scale.appendChild(img);
+
+        wrapper.addEventListener('pointerenter', () => { scale.style.transform = 'scale(1.02)'; }, { passive: true });
+        wrapper.addEventListener('pointerleave', () => { scale.style.transform = 'scale(1)'; }, { passive: true });
+        img.dataset.zoomReady = 'true';
+    }
+}
@@ -10,10 +10,18 @@ const HEADER_OFFSET_DEFAULT_PX = 40;
 const ANCHOR_EXTRA_OFFSET_DEFAULT_PX = 12;
 const HEADER_BORDER_SCROLL_THRESHOLD = 250;
 const TOOLTIP_DISPLAY_MS = 1800;
-const DROPDOWN_OPEN_DELAY_MS = 40;
-const DROPDOWN_CLOSE_DELAY_MS = 140;
 const DESKTOP_BREAKPOINT_PX = 1024;
-const YOUTUBE_FETCH_TIMEOUT_MS = 8000;
+const PREFETCH_MAX_CONCURRENT = 2;
+const PREFETCH_HOVER_DELAY_MS = 65;
+const THIRD_PARTY_IDLE_TIMEOUT_MS = 4000;
+const THIRD_PARTY_IDLE_FALLBACK_MS = 1500;
+const SECTION_ROOT_MARGIN = '50% 0px';
+const ANCHOR_SETTLE_FRAMES = 10;
+const INSTANT_NAV_REGIONS = ['.site-page', '#right-sidebar', '.site-pagination'];
+const INSTANT_NAV_HEAD = [
+    'meta[name="description"]', 'meta[property^="og:"]', 'meta[name^="twitter:"]',
+    'link[rel="canonical"]', 'link[rel="next"]', 'link[rel="prev"]',
+].join(', ');
 
 /**
  * Parse a CSS duration variable into milliseconds.
@@ -76,7 +84,159 @@ function applyTheme(mode, maxWait) {
 // Expose on window so Alpine.js inline expressions can reach it.
 window.simpleApplyTheme = applyTheme;
 
-document.addEventListener('DOMContentLoaded', () => {
+const contentInitializers = [];
+
+/**
+ * Register an initialiser for components living in the article body.
+ *
+ * The initialiser runs once the DOM is ready and again every time
+ * instant navigation swaps the article body for another page's.
+ *
+ * @param {(root: ParentNode) => void} fn - Receives the subtree to set up.
+ */
+function onContentReady(fn) {
+    contentInitializers.push(fn);
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', () => fn(document), { once: true });
+    } else {
+        fn(document);
+    }
+}
+
+/**
+ * Re-run every registered content initialiser against `root`.
+ *
+ * @param {ParentNode} root - Freshly inserted subtree.
+ */
+function runContentInitializers(root) {
+    for (const fn of contentInitializers) {
+        try { fn(root); } catch (err) { console.error(err); }
+    }
+}
+
+const DEFERRED_SECTION = '[data-deferred]';
+const sectionInitializers = [];
+const sectionObserver = 'IntersectionObserver' in window
+    ? new IntersectionObserver((entries) => {
+        for (const entry of entries) {
+            if (!entry.isIntersecting) continue;
+            sectionObserver.unobserve(entry.target);
+            readySection(entry.target);
+        }
+    }, { rootMargin: SECTION_ROOT_MARGIN })
+    : null;
+
+/**
+ * Select the elements of `root`, leaving out the deferred sections.
+ *
+ * The build marks the sections of long articles with `data-deferred`
+ * (see `theme/extensions/sections.py`), which the browser doesn't
+ * render until they're scrolled near. Their components are set up at
+ * the same time, when the attribute is removed.
+ *
+ * @param {ParentNode} root - Subtree to search.
+ * @param {string} selector - CSS selector.
+ * @returns {Element[]} The matching elements outside deferred sections.
+ */
+function scoped(root, selector) {
+    const found = Array.from(root.querySelectorAll(selector));
+    return sectionObserver ? found.filter(el => !el.closest(DEFERRED_SECTION)) : found;
+}
+
+function readySection(section) {
+    section.removeAttribute('data-deferred');
+    for (const fn of sectionInitializers) {
+        try { fn(section, scoped); } catch (err) { console.error(err); }
+    }
+}
+
+/**
+ * Register an initialiser for components which may live in a deferred
+ * section of the article.
+ *
+ * The initialiser runs like `onContentReady`, but should only select
+ * elements with the `select` function it receives. It runs again for
+ * each deferred section as the section approaches the viewport.
+ *
+ * @param {(root: ParentNode, select: typeof scoped) => void} fn - Receives the subtree to set up.
+ */
+function onSectionReady(fn) {
+    sectionInitializers.push(fn);
+    onContentReady((root) => {
+        fn(root, scoped);
+        if (sectionObserver) root.querySelectorAll(DEFERRED_SECTION).forEach(el => sectionObserver.observe(el));
+    });
+}
+
+const featureBase = new URL('modules/', document.currentScript ? document.currentScript.src : location.href);
+const featureModules = new Map();
+
+/**
+ * Import a feature module from `_static/modules`, only once.
+ *
+ * @param {string} name - Module name, e.g. `zoom`.
+ * @returns {Promise<Module>} The module's namespace.
+ */
+function loadFeature(name) {
+    if (!featureModules.has(name)) {
+        featureModules.set(name, import(new URL(`${name}.js`, featureBase).href));
+    }
+    return featureModules.get(name);
+}
+
+/**
+ * Set up the features the build recorded for the page.
+ *
+ * The page lists them in the `data-features` attribute of its
+ * `.site-page`, which instant navigation swaps along with the article,
+ * so a text-only page never fetches nor parses their modules.
+ */
+onSectionReady((root, select) => {
+    const host = (root.closest && root.closest('[data-features]')) || root.querySelector('[data-features]');
+    if (!host) return;
+    for (const name of host.dataset.features.split(' ').filter(Boolean)) {
+        loadFeature(name).then(module => module.default(root, select)).catch(err => console.error(err));
+    }
+});
+
+(function () {
+    function loadDropdowns() {
+        if (!document.querySelector('.site-header__nav-tree p.caption')) return;
+        loadFeature('dropdowns').then(module => module.default()).catch(err => console.error(err));
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', loadDropdowns, { once: true });
+    } else {
+        loadDropdowns();
+    }
+})();
+
+/**
+ * Keep the light/dark `<picture>` sources in sync with the theme.
+ *
+ * The markup selects the variant using `prefers-color-scheme`, which
+ * the browser resolves while parsing. Only when the user has picked a
+ * scheme explicitly are the dark sources forced on (`all`) or off
+ * (`not all`) to match it.
+ */
+(function () {
+    const SYSTEM_MEDIA = '(prefers-color-scheme: dark)';
+
+    function syncPictures(root, select) {
+        const mode = document.documentElement.getAttribute('data-theme');
+        const media = mode === 'dark' ? 'all' : mode === 'light' ? 'not all' : SYSTEM_MEDIA;
+        select(root, 'picture[data-color-scheme] > source').forEach((source) => {
+            if (source.getAttribute('media') !== media) source.setAttribute('media', media);
+        });
+    }
+
+    new MutationObserver(() => syncPictures(document, scoped))
+        .observe(document.documentElement, { attributes: true, attributeFilter: ['data-theme'] });
+    onSectionReady(syncPictures);
+})();
+
+onContentReady(() => {
     const root = document.getElementById('content')
         || document.querySelector('[role="main"]')
         || document.querySelector('section');
@@ -223,16 +383,32 @@ document.addEventListener('DOMContentLoaded', () => {
         const duration = Math.max(ANCHOR_SCROLL_MIN_MS,
             Math.min(ANCHOR_SCROLL_MAX_MS, base + Math.min(ANCHOR_SCROLL_DIST_CAP_MS, dist * ANCHOR_SCROLL_PX_FACTOR)));
 
-        smoothScrollTo(targetY, duration).then(() => {
+        smoothScrollTo(targetY, duration).then(() => settle(el)).then(() => {
             try { history.pushState(null, '', '#' + id); } catch { /* noop */ }
         });
     }
 
+    // The deferred sections passed on the way only take their real
+    // height once rendered, which moves the target after the scroll
+    // was planned, so it's re-aligned until it stays put.
+    function settle(el, frames = ANCHOR_SETTLE_FRAMES) {
+        return new Promise(resolve => {
+            function check(left) {
+                const delta = el.getBoundingClientRect().top - getHeaderOffsetPx();
+                if (Math.abs(delta) < 1 || left === 0) { resolve(); return; }
+                window.scrollBy({ top: delta, behavior: 'instant' });
+                requestAnimationFrame(() => check(left - 1));
+            }
+            check(frames);
+        });
+    }
+
+    document.addEventListener('click', function (e) {
+        const link = e.target.closest && e.target.closest('a[href^="#"]');
+        if (link) onAnchorClick.call(link, e);
+    }, { passive: false });
+
     document.addEventListener('DOMContentLoaded', function () {
-        const links = document.querySelectorAll('a[href^="#"]');
-        for (const link of links) {
-            link.addEventListener('click', onAnchorClick, { passive: false });
-        }
         if (location.hash && location.hash.length > 1) {
             const id = decodeURIComponent(location.hash.slice(1));
             const el = document.getElementById(id);
@@ -273,8 +449,8 @@ document.addEventListener('DOMContentLoaded', () => {
         return (c && c.href) ? c.href : window.location.href;
     }
 
-    function initCopyUrl() {
-        const links = document.querySelectorAll('a.copy-url');
+    function initCopyUrl(root) {
+        const links = root.querySelectorAll('a.copy-url');
         if (!links.length) return;
         links.forEach(link => {
             link.addEventListener('click', async (e) => {
@@ -286,11 +462,7 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
-    if (document.readyState === 'loading') {
-        document.addEventListener('DOMContentLoaded', initCopyUrl);
-    } else {
-        initCopyUrl();
-    }
+    onContentReady(initCopyUrl);
 })();
 
 (function () {
@@ -321,74 +493,6 @@ document.addEventListener('DOMContentLoaded', () => {
     }, { passive: true });
 })();
 
-(function () {
-    if (window.matchMedia('(prefers-reduced-motion: reduce)').matches) return;
-
-    function setupZoom(el, wrapperParent) {
-        const isFaceWrap = el.classList && el.classList.contains('face-tag-wrap');
-        const img = isFaceWrap ? el.querySelector('img') : el;
-        if (!img || img.classList.contains('no-zoom')) {
-            if (wrapperParent) wrapperParent.dataset.zoomReady = 'true';
-            return;
-        }
-
-        const wrapper = document.createElement('div');
-        wrapper.className = 'zoom-inner';
-        wrapper.style.cssText = 'position:relative;overflow:hidden;border-radius:var(--radius);line-height:0;display:block';
-
-        if (isFaceWrap) {
-            el.style.display = 'block';
-            el.style.lineHeight = '0';
-        } else if (img instanceof HTMLImageElement) {
-            img.style.cssText = 'border-radius:0;display:block;width:100%;height:auto';
-        }
-
-        const scale = document.createElement('div');
-        scale.className = 'zoom-scale';
-        scale.style.cssText = 'transform-origin:center;transition:transform var(--duration-slow) var(--ease-in-out);display:block;line-height:0';
-
-        const parent = wrapperParent || el.parentElement;
-        parent.insertBefore(wrapper, el);
-        wrapper.appendChild(scale);
-        scale.appendChild(el);
-
-        wrapper.addEventListener('pointerenter', () => { scale.style.transform = 'scale(1.02)'; }, { passive: true });
-        wrapper.addEventListener('pointerleave', () => { scale.style.transform = 'scale(1)'; }, { passive: true });
-    }
-
-    // Figures with .zoom class
-    const figures = document.querySelectorAll('#content figure.zoom:not([data-zoom-ready]) > :is(img, .face-tag-wrap)');
-    for (const el of figures) {
-        const figure = el.parentElement;
-        if (!figure || figure.dataset.zoomReady === 'true') continue;
-        setupZoom(el, figure);
-        figure.dataset.zoomReady = 'true';
-    }
-
-    // Standalone images with .zoom class
-    const singles = document.querySelectorAll('#content img.zoom:not(figure img):not(.no-zoom):not([data-zoom-ready])');
-    for (const img of singles) {
-        if (img.dataset.zoomReady === 'true') continue;
-        const wrapper = document.createElement('div');
-        wrapper.className = 'zoom-inner';
-        wrapper.style.cssText = 'position:relative;overflow:hidden;border-radius:var(--radius);line-height:0;display:block;margin:4rem auto';
-
-        img.style.cssText = 'margin:0;border-radius:0;display:block;width:100%;height:auto';
-
-        const scale = document.createElement('div');
-        scale.className = 'zoom-scale';
-        scale.style.cssText = 'transform-origin:center;transition:transform var(--duration-slow) var(--ease-in-out);display:block;line-height:0';
-
-        img.parentElement.insertBefore(wrapper, img);
-        wrapper.appendChild(scale);
-        scale.appendChild(img);
-
-        wrapper.addEventListener('pointerenter', () => { scale.style.transform = 'scale(1.02)'; }, { passive: true });
-        wrapper.addEventListener('pointerleave', () => { scale.style.transform = 'scale(1)'; }, { passive: true });
-        img.dataset.zoomReady = 'true';
-    }
-})();
-
 function initLeftSidebarAccordion() {
     const sidebars = document.querySelectorAll('.site-sidebar--primary');
     if (!sidebars.length) return;
@@ -447,7 +551,8 @@ function initLeftSidebarAccordion() {
                     collapseOthers(li);
                     setExpanded(li, true);
                     const d = getDurationMs('--duration-normal', 500);
-                    setTimeout(() => { window.location.href = href; }, d);
+                    const go = window.simpleNavigate || ((url) => { window.location.href = url; });
+                    setTimeout(() => go(href), d);
                 } else {
                     e.preventDefault(); e.stopPropagation();
                     toggle(li);
@@ -545,134 +650,276 @@ if (document.readyState === 'loading') {
     }
 })();
 
+onContentReady(function (root) {
+    root.querySelectorAll('h1').forEach(h1 => {
+        const text = h1.textContent;
+        const trimmed = text.replace(/^\s+/, '');
+        if (text !== trimmed) h1.textContent = trimmed;
+    });
+});
+
 (function () {
-    function buildHeaderNavDropdowns() {
-        const nav = document.querySelector('.site-header__nav-tree');
-        if (!nav) return;
-        const captions = Array.from(nav.querySelectorAll('p.caption'));
-        if (!captions.length) return;
+    if (document.body.dataset.prefetch !== 'on') return;
+    if (location.protocol === 'file:') return;
+    const conn = navigator.connection;
+    if (conn && (conn.saveData || /(^|-)2g$/.test(conn.effectiveType || ''))) return;
+
+    const supportsLink = (() => {
+        try { return document.createElement('link').relList.supports('prefetch'); }
+        catch { return false; }
+    })();
+    const seen = new Set();
+    const queue = [];
+    let inflight = 0;
+
+    function target(link) {
+        if (!link || link.hasAttribute('download')) return null;
+        if (link.target && link.target !== '_self') return null;
+        let url;
+        try { url = new URL(link.href, location.href); } catch { return null; }
+        if (url.origin !== location.origin) return null;
+        if (url.pathname === location.pathname && url.search === location.search) return null;
+        url.hash = '';
+        return seen.has(url.href) ? null : url.href;
+    }
 
-        let uid = 0;
-        captions.forEach((caption) => {
-            const list = caption.nextElementSibling;
-            if (!list || list.tagName !== 'UL') return;
-
-            const wrapper = document.createElement('div');
-            wrapper.className = 'site-header__nav-group';
-            caption.parentNode.insertBefore(wrapper, caption);
-            wrapper.appendChild(caption);
-            wrapper.appendChild(list);
-
-            const listId = list.id || `nav-group-${++uid}`;
-            list.id = listId;
-            caption.setAttribute('tabindex', '0');
-            caption.setAttribute('role', 'button');
-            caption.setAttribute('aria-haspopup', 'true');
-            caption.setAttribute('aria-controls', listId);
-            caption.setAttribute('aria-expanded', 'false');
-
-            let openTimer = null;
-            let closeTimer = null;
-
-            const open = () => {
-                clearTimeout(closeTimer);
-                openTimer = setTimeout(() => {
-                    wrapper.classList.add('is-open');
-                    caption.setAttribute('aria-expanded', 'true');
-                }, DROPDOWN_OPEN_DELAY_MS);
-            };
-            const close = () => {
-                clearTimeout(openTimer);
-                closeTimer = setTimeout(() => {
-                    wrapper.classList.remove('is-open');
-                    caption.setAttribute('aria-expanded', 'false');
-                }, DROPDOWN_CLOSE_DELAY_MS);
-            };
+    function done() {
+        inflight--;
+        pump();
+    }
 
-            caption.addEventListener('mouseenter', open, { passive: true });
-            wrapper.addEventListener('mouseenter', open, { passive: true });
-            wrapper.addEventListener('mouseleave', close, { passive: true });
-            caption.addEventListener('focus', open, { passive: true });
-            wrapper.addEventListener('focusout', (e) => {
-                if (!wrapper.contains(e.relatedTarget)) close();
-            });
+    function pump() {
+        while (inflight < PREFETCH_MAX_CONCURRENT && queue.length) {
+            const href = queue.shift();
+            inflight++;
+            if (supportsLink) {
+                const link = document.createElement('link');
+                link.rel = 'prefetch';
+                link.href = href;
+                link.onload = done;
+                link.onerror = done;
+                document.head.appendChild(link);
+            } else {
+                fetch(href, { credentials: 'same-origin', priority: 'low' })
+                    .catch(() => { /* Prefetching is best-effort. */ })
+                    .finally(done);
+            }
+        }
+    }
 
-            caption.addEventListener('keydown', (e) => {
-                if (e.key === 'Enter' || e.key === ' ') {
-                    e.preventDefault();
-                    wrapper.classList.contains('is-open') ? close() : open();
-                }
-                if (e.key === 'Escape') { close(); caption.blur(); }
-            });
-        });
+    function prefetch(link, urgent) {
+        const href = target(link);
+        if (!href) return;
+        seen.add(href);
+        if (urgent) queue.unshift(href); else queue.push(href);
+        pump();
     }
 
-    if (document.readyState === 'loading') {
-        document.addEventListener('DOMContentLoaded', buildHeaderNavDropdowns, { once: true });
-    } else {
-        buildHeaderNavDropdowns();
+    let hoverTimer = null;
+    function onHover(e) {
+        const link = e.target.closest && e.target.closest('a[href]');
+        if (!link) return;
+        clearTimeout(hoverTimer);
+        hoverTimer = setTimeout(() => prefetch(link, true), PREFETCH_HOVER_DELAY_MS);
     }
-})();
+    document.addEventListener('pointerover', onHover, { passive: true });
+    document.addEventListener('focusin', onHover, { passive: true });
+    document.addEventListener('touchstart', (e) => {
+        const link = e.target.closest && e.target.closest('a[href]');
+        if (link) prefetch(link, true);
+    }, { passive: true });
 
-document.addEventListener('DOMContentLoaded', function () {
-    document.querySelectorAll('h1').forEach(h1 => {
-        const text = h1.textContent;
-        const trimmed = text.replace(/^\s+/, '');
-        if (text !== trimmed) h1.textContent = trimmed;
-    });
-});
+    // The next and previous pages are the likeliest to be read next.
+    function adjacent() {
+        document.querySelectorAll('link[rel="next"], link[rel="prev"]').forEach(l => prefetch(l, false));
+    }
 
-(function () {
-    function intersectOnce(nodes, onEnter) {
-        const list = Array.from(nodes);
-        if (!list.length) return;
-        if (!('IntersectionObserver' in window)) { list.forEach(onEnter); return; }
+    function observe() {
+        if (!('IntersectionObserver' in window)) return;
+        const links = document.querySelectorAll(
+            '.site-pagination a[href], #content a.reference.internal[href]:not([href^="#"])');
+        if (!links.length) return;
         const io = new IntersectionObserver((entries) => {
             for (const e of entries) {
-                if (e.isIntersecting) { io.unobserve(e.target); onEnter(e.target); }
+                if (e.isIntersecting) { io.unobserve(e.target); prefetch(e.target, false); }
             }
-        }, { rootMargin: '200px' });
-        list.forEach(n => io.observe(n));
+        });
+        links.forEach(l => io.observe(l));
     }
 
-    async function enrichYouTubeCard(card) {
-        const host = card.matches('[data-youtube-id]') ? card : card.closest('[data-youtube-id]');
-        if (!host || host.dataset.youtubeEnriched === '1') return;
-        const vid = host.getAttribute('data-youtube-id');
-        if (!vid) { host.dataset.youtubeEnriched = '1'; return; }
+    const idle = window.requestIdleCallback || ((fn) => setTimeout(fn, 1));
+    const start = () => { adjacent(); observe(); };
+    if (document.readyState === 'complete') idle(start);
+    else window.addEventListener('load', () => idle(start), { once: true });
+    document.addEventListener('simple:navigated', () => idle(start));
+})();
 
-        const url = 'https://www.youtube.com/oembed?url='
-            + encodeURIComponent('https://www.youtube.com/watch?v=' + vid) + '&format=json';
+(function () {
+    if (document.body.dataset.instantNavigation !== 'on') return;
+    if (location.protocol === 'file:' || !window.DOMParser || !history.pushState) return;
 
-        const ctrl = new AbortController();
-        const timer = setTimeout(() => ctrl.abort(), YOUTUBE_FETCH_TIMEOUT_MS);
-        try {
-            const res = await fetch(url, { signal: ctrl.signal });
-            if (!res.ok) throw new Error(String(res.status));
-            const data = await res.json();
-            const titleEl = host.querySelector('.site-youtube-card__title');
-            const channelEl = host.querySelector('.site-youtube-card__channel');
-            if (titleEl && data.title) titleEl.textContent = data.title;
-            if (channelEl && data.author_name) channelEl.textContent = data.author_name;
-        } catch {
-            /* Network errors are non-critical; card keeps its fallback text. */
-        } finally {
-            clearTimeout(timer);
-            host.dataset.youtubeEnriched = '1';
+    let controller = null;
+    let currentUrl = location.href;
+
+    function absolute(root, attr) {
+        root.querySelectorAll(`[${attr}]`).forEach(el => {
+            const value = el.getAttribute(attr);
+            if (!value || /^[a-z][a-z0-9+.-]*:/i.test(value)) return;
+            el.setAttribute(attr, new URL(value, location.href).href);
+        });
+    }
+
+    // Header, sidebar and footer outlive the page they were rendered
+    // for, so their relative URLs are pinned before the first swap.
+    function pinPersistentRegions() {
+        document.querySelectorAll('.site-header, #left-sidebar, .site-footer').forEach(region => {
+            absolute(region, 'href');
+            absolute(region, 'src');
+        });
+    }
+
+    function assetKey(doc, base) {
+        return Array.from(
+            doc.querySelectorAll('script[src], link[rel="stylesheet"]'),
+            el => new URL(el.getAttribute('src') || el.getAttribute('href'), base).href,
+        ).sort().join('\n');
+    }
+
+    function markCurrent(url) {
+        const here = url.split('#')[0];
+        document.querySelectorAll('#left-sidebar, .site-header__nav-tree').forEach(nav => {
+            nav.querySelectorAll('.current').forEach(el => el.classList.remove('current'));
+            const branches = new Set();
+            for (const a of nav.querySelectorAll('a[href]')) {
+                if (a.href.split('#')[0] !== here) continue;
+                a.classList.add('current');
+                for (let li = a.closest('li'); li && nav.contains(li); li = li.parentElement.closest('li')) {
+                    li.classList.add('current');
+                    if (li.parentElement) li.parentElement.classList.add('current');
+                    branches.add(li);
+                }
+            }
+            nav.querySelectorAll('li.has-children').forEach(li => {
+                li.setAttribute('aria-expanded', branches.has(li) ? 'true' : 'false');
+            });
+        });
+    }
+
+    function updateHead(doc) {
+        document.title = doc.title;
+        document.head.querySelectorAll(INSTANT_NAV_HEAD).forEach(el => el.remove());
+        doc.head.querySelectorAll(INSTANT_NAV_HEAD).forEach(el => {
+            document.head.appendChild(document.importNode(el, true));
+        });
+        const root = doc.documentElement.getAttribute('data-content_root');
+        if (root !== null) document.documentElement.setAttribute('data-content_root', root);
+    }
+
+    function revive(region) {
+        region.querySelectorAll('script').forEach(old => {
+            const script = document.createElement('script');
+            for (const { name, value } of old.attributes) script.setAttribute(name, value);
+            script.textContent = old.textContent;
+            old.replaceWith(script);
+        });
+    }
+
+    function plan(doc) {
+        const swaps = [];
+        for (const selector of INSTANT_NAV_REGIONS) {
+            const from = document.querySelector(selector);
+            const to = doc.querySelector(selector);
+            if (to && !from) return null;
+            if (from) swaps.push([from, to]);
         }
+        return swaps;
     }
 
-    function boot() {
-        const cards = document.querySelectorAll(
-            '.site-youtube-card[data-youtube-id], .youtube-card-container[data-youtube-id]');
-        if (cards.length) intersectOnce(cards, enrichYouTubeCard);
+    function restoreScroll(url, scrollY) {
+        if (typeof scrollY === 'number') { window.scrollTo(0, scrollY); return; }
+        const id = url.hash ? decodeURIComponent(url.hash.slice(1)) : '';
+        const el = id && document.getElementById(id);
+        if (el) el.scrollIntoView(); else window.scrollTo(0, 0);
     }
 
-    if (document.readyState === 'loading') {
-        document.addEventListener('DOMContentLoaded', boot);
-    } else {
-        boot();
+    async function navigate(href, push = true, scrollY = null) {
+        const url = new URL(href, location.href);
+        if (controller) controller.abort();
+        const ctrl = controller = new AbortController();
+        document.documentElement.classList.add('is-navigating');
+        try {
+            const res = await fetch(url.href, {
+                credentials: 'same-origin',
+                headers: { Accept: 'text/html' },
+                signal: ctrl.signal,
+            });
+            if (!res.ok || !(res.headers.get('content-type') || '').includes('text/html')) {
+                throw new Error(String(res.status));
+            }
+            const target = new URL(res.url || url.href);
+            target.hash = url.hash;
+            const doc = new DOMParser().parseFromString(await res.text(), 'text/html');
+            const swaps = doc.getElementById('content') && plan(doc);
+            if (!swaps || assetKey(doc, target.href) !== assetKey(document, location.href)) {
+                throw new Error('Page needs a full load');
+            }
+            if (push) {
+                history.replaceState({ ...(history.state || {}), instant: true, scrollY: window.scrollY }, '');
+                history.pushState({ instant: true }, '', target.href);
+            }
+            currentUrl = location.href;
+            const inserted = [];
+            for (const [from, to] of swaps) {
+                if (!to) { from.remove(); continue; }
+                const node = document.importNode(to, true);
+                from.replaceWith(node);
+                revive(node);
+                inserted.push(node);
+            }
+            updateHead(doc);
+            markCurrent(location.href);
+            inserted.forEach(runContentInitializers);
+            restoreScroll(target, scrollY);
+            const content = document.getElementById('content');
+            if (content) {
+                content.setAttribute('tabindex', '-1');
+                content.focus({ preventScroll: true });
+            }
+            document.dispatchEvent(new CustomEvent('simple:navigated', { detail: { url: location.href } }));
+        } catch (err) {
+            if (err && err.name === 'AbortError') return;
+            if (push) location.assign(url.href); else location.reload();
+        } finally {
+            if (controller === ctrl) {
+                controller = null;
+                document.documentElement.classList.remove('is-navigating');
+            }
+        }
     }
+
+    document.addEventListener('click', (e) => {
+        if (e.defaultPrevented || e.button !== 0 || e.metaKey || e.ctrlKey || e.shiftKey || e.altKey) return;
+        const link = e.target.closest && e.target.closest('a[href]');
+        if (!link || link.hasAttribute('download') || 'noInstant' in link.dataset) return;
+        if (link.target && link.target !== '_self') return;
+        const url = new URL(link.href, location.href);
+        if (url.origin !== location.origin) return;
+        if (url.pathname === location.pathname && url.search === location.search) return;
+        if (/\.(?!html?$)[a-z0-9]+$/i.test(url.pathname)) return;
+        e.preventDefault();
+        navigate(url.href);
+    });
+
+    window.addEventListener('popstate', (e) => {
+        const previous = currentUrl;
+        currentUrl = location.href;
+        if (previous.split('#')[0] === location.href.split('#')[0]) return;
+        navigate(location.href, false, e.state && e.state.scrollY);
+    });
+
+    history.replaceState({ ...(history.state || {}), instant: true }, '');
+    pinPersistentRegions();
+    window.simpleNavigate = navigate;
 })();
 
 function formatNumber(num) {
@@ -680,32 +927,111 @@ function formatNumber(num) {
     return num;
 }
 
-(function (C, A, L) {
-    let p = function (a, ar) { a.q.push(ar); };
-    let d = C.document;
-    C.Cal = C.Cal || function () {
-        let cal = C.Cal;
-        let ar = arguments;
-        if (!cal.loaded) {
-            cal.ns = {};
+/**
+ * Load the third-party scripts declared in `html_context`, off the
+ * critical path.
+ *
+ * The layout serialises `third_party_scripts` into a JSON block. Each
+ * entry is loaded according to its `load` mode:
+ *
+ * - `idle`: once the page has loaded and the main thread is idle, e.g.
+ *   analytics.
+ * - `interaction`: on the first hover, focus, or touch of an element
+ *   matching its `trigger`, e.g. the cal.com booking embed. A click
+ *   landing before the script has loaded is replayed once it has.
+ *
+ * An entry may name a `setup`, which runs right before its script is
+ * added, e.g. to queue the calls the script expects to find.
+ */
+(function () {
+    const config = document.getElementById('third-party-scripts');
+    if (!config) return;
+    let entries;
+    try { entries = JSON.parse(config.textContent); } catch { return; }
+
+    const setups = {
+        // The cal.com snippet, minus adding the script, which the
+        // loader does. Every namespace used by the triggers is
+        // initialised, with the entry's `ui` options if any.
+        cal(entry) {
+            const push = (api, args) => { api.q.push(args); };
+            const cal = window.Cal = window.Cal || function () {
+                const args = arguments;
+                if (args[0] === 'init') {
+                    const api = function () { push(api, arguments); };
+                    const namespace = args[1];
+                    api.q = api.q || [];
+                    if (typeof namespace === 'string') {
+                        cal.ns[namespace] = cal.ns[namespace] || api;
+                        push(cal.ns[namespace], args);
+                        push(cal, ['initNamespace', namespace]);
+                    } else push(cal, args);
+                    return;
+                }
+                push(cal, args);
+            };
+            cal.ns = cal.ns || {};
             cal.q = cal.q || [];
-            d.head.appendChild(d.createElement('script')).src = A;
             cal.loaded = true;
-        }
-        if (ar[0] === L) {
-            const api = function () { p(api, arguments); };
-            const namespace = ar[1];
-            api.q = api.q || [];
-            if (typeof namespace === 'string') {
-                cal.ns[namespace] = cal.ns[namespace] || api;
-                p(cal.ns[namespace], ar);
-                p(cal, ['initNamespace', namespace]);
-            } else p(cal, ar);
-            return;
-        }
-        p(cal, ar);
+            const origin = new URL(entry.src).origin;
+            const namespaces = new Set(Array.from(
+                document.querySelectorAll(`${entry.trigger}[data-cal-namespace]`),
+                el => el.dataset.calNamespace));
+            for (const namespace of namespaces) {
+                cal('init', namespace, { origin });
+                if (entry.ui) cal.ns[namespace]('ui', entry.ui);
+            }
+        },
     };
-})(window, 'https://app.cal.com/embed/embed.js', 'init');
 
-Cal('init', 'quick-chat', { origin: 'https://app.cal.com' });
-Cal.ns['quick-chat']('ui', { hideEventTypeDetails: false, layout: 'month_view' });
+    function inject(entry) {
+        return new Promise((resolve, reject) => {
+            if (entry.setup && setups[entry.setup]) setups[entry.setup](entry);
+            const script = document.createElement('script');
+            for (const [name, value] of Object.entries(entry.attributes || {})) {
+                script.setAttribute(name, value);
+            }
+            script.async = true;
+            script.onload = resolve;
+            script.onerror = reject;
+            script.src = entry.src;
+            document.head.appendChild(script);
+        });
+    }
+
+    function whenIdle(entry) {
+        const schedule = () => {
+            if ('requestIdleCallback' in window) {
+                requestIdleCallback(() => inject(entry).catch(() => {}), { timeout: THIRD_PARTY_IDLE_TIMEOUT_MS });
+            } else {
+                setTimeout(() => inject(entry).catch(() => {}), THIRD_PARTY_IDLE_FALLBACK_MS);
+            }
+        };
+        if (document.readyState === 'complete') schedule();
+        else window.addEventListener('load', schedule, { once: true });
+    }
+
+    function onInteraction(entry) {
+        let loading = null;
+        let settled = false;
+        const load = () => loading || (loading = inject(entry).finally(() => { settled = true; }));
+        const matches = (e) => e.target instanceof Element && e.target.closest(entry.trigger);
+
+        for (const type of ['pointerover', 'focusin', 'touchstart']) {
+            document.addEventListener(type, (e) => { if (matches(e)) load().catch(() => {}); }, { passive: true });
+        }
+        document.addEventListener('click', (e) => {
+            const el = matches(e);
+            if (!el || settled) return;
+            e.preventDefault();
+            e.stopPropagation();
+            load().catch(() => {}).then(() => el.click());
+        }, true);
+    }
+
+    for (const entry of entries) {
+        if (!entry || !entry.src) continue;
+        if (entry.load === 'interaction' && entry.trigger) onInteraction(entry);
+        else whenIdle(entry);
+    }
+})();
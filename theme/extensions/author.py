@@ -4,7 +4,7 @@ Author Directive
 
 Author: Akshay Mestry <xa@mes3.dev>
 Created on: 22 February, 2025
-Last updated on: 15 January, 2026
+Last updated on: 19 October, 2026
 
 This module defines a custom `author` directive for this sphinx theme.
 The directive allows embedding details directly within the document.
@@ -39,6 +39,11 @@ theme's Jinja2 template, producing a final HTML output.
 .. deprecated:: 15.01.2026
 
     Removed usage of Email, Bio, and LinkedIn metadata.
+
+.. versionchanged:: 19.10.2026
+
+    The `author` node no longer carries a copy of the `html_context`,
+    the project's defaults are looked up when the page is written.
 """
 
 from __future__ import annotations
@@ -50,6 +55,8 @@ import docutils.nodes as nodes
 import docutils.parsers.rst as rst
 import jinja2
 
+from theme.extensions import cache
+
 if t.TYPE_CHECKING:
     from sphinx.writers.html import HTMLTranslator
 
@@ -123,9 +130,12 @@ class directive(rst.Directive):
 
             The `option_spec` will take precedence over the
             `html_context` values.
+
+        .. versionchanged:: 19.10.2026
+
+            Only the options are stored in the node, the defaults are
+            resolved from the `html_context` by `visit`.
         """
-        ctx = self.state.document.settings.env.config.html_context
-        self.options.update(ctx)
         element = node("\n".join(self.content), **self.options)
         return [element]
 
@@ -139,12 +149,22 @@ def visit(self: HTMLTranslator, node: node) -> None:
     attributes from the node (if any) and uses Jinja2 templating to
     produce the final HTML output.
 
+    The options missing from the node default to the project's details
+    from the `html_context` in `conf.py`.
+
     :param self: The HTML translator instance responsible for rendering
         nodes into HTML.
     :param node: The `author` node containing parsed attributes.
 
+    .. versionchanged:: 19.10.2026
+
+        The project's details are read from the configuration instead
+        of the node.
     """
-    self.body.append(template.render(**node.attributes))
+    project = self.config.html_context.get("project", {})
+    self.body.append(
+        cache.render(name, template, project=project, **node.attributes)
+    )
 
 
 def depart(self: HTMLTranslator, node: node) -> None:
@@ -0,0 +1,194 @@
+"""\
+Render Cache
+============
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module provides a least-recently-used cache for the HTML rendered
+by the theme's directives.
+
+Many pages render the same directive with the same options, e.g., the
+`author` block with the project's defaults, the same `repository`, or
+the same video cited across pages. The directives' visitors render
+through `render`, which keys the output by the directive's name and
+its normalised context, and only renders the template on a miss.
+
+The cache is persisted in the doctree directory when the build
+finishes and loaded back for the next (incremental) build, as long as
+the templates haven't changed since. The hits and misses of every
+directive are logged at the end of the build.
+
+.. note::
+
+    Sphinx forks worker processes for parallel (`-j`) builds, which
+    exit without returning anything to the main process. Hence, like
+    the build tracing, the workers spill their lookups to per-process
+    files and the main process merges them at the end.
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import json
+import os
+import os.path as p
+import pickle
+import typing as t
+from pathlib import Path
+
+from sphinx.util import logging
+
+if t.TYPE_CHECKING:
+    import jinja2
+    from sphinx.application import Sphinx
+
+logger = logging.getLogger(__name__)
+
+size: t.Final[int] = 1024
+here: str = p.dirname(__file__)
+templates = Path(p.abspath(p.join(here, "../base/templates")))
+
+entries: collections.OrderedDict[str, str] = collections.OrderedDict()
+counters: dict[str, list[int]] = {}
+main_pid: int = os.getpid()
+directory: Path | None = None
+spill: t.TextIO | None = None
+
+
+def fingerprint() -> str:
+    """Return a digest of the directives' templates.
+
+    The persisted cache is only reused if the templates which rendered
+    it are the same.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(templates.glob("*.html.jinja")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def key(name: str, context: dict[str, t.Any]) -> str:
+    """Return the cache key of a directive's rendering context.
+
+    The context is normalised as JSON with sorted keys, so that equal
+    options produce equal keys regardless of their order.
+    """
+    return f"{name}:{json.dumps(context, sort_keys=True, default=str)}"
+
+
+def render(
+    name: str,
+    template: jinja2.Template,
+    /,
+    **context: t.Any,
+) -> str:
+    """Render a directive's template, reusing the cached output.
+
+    The name and the template are positional-only, so that they don't
+    clash with the directives' options of the same name.
+
+    :param name: Name of the directive rendering the template.
+    :param template: The directive's Jinja2 template.
+    :param context: Variables to render the template with.
+    :return: The rendered HTML.
+    """
+    lookup = key(name, context)
+    html = entries.get(lookup)
+    hit = html is not None
+    if html is not None:
+        entries.move_to_end(lookup)
+    else:
+        html = entries[lookup] = template.render(**context)
+        if len(entries) > size:
+            entries.popitem(last=False)
+    count(name, hit=hit)
+    record(name, lookup, None if hit else html)
+    return html
+
+
+def count(name: str, *, hit: bool) -> None:
+    """Count a hit or a miss of a directive's lookup."""
+    counters.setdefault(name, [0, 0])[0 if hit else 1] += 1
+
+
+def record(name: str, lookup: str, html: str | None) -> None:
+    """Spill the lookups of the forked worker processes.
+
+    Hits are spilled without the HTML, misses along with the rendered
+    HTML, so that the main process can count both and keep the latter.
+    """
+    global spill
+    pid = os.getpid()
+    if pid == main_pid or directory is None:
+        return
+    if spill is None:
+        path = directory / f"{pid}.jsonl"
+        spill = path.open("a", encoding="utf-8", buffering=1)
+    spill.write(json.dumps({"name": name, "key": lookup, "html": html}))
+    spill.write("\n")
+
+
+def builder_inited(app: Sphinx) -> None:
+    """Load the cache persisted by the previous build.
+
+    :param app: The Sphinx application instance.
+    """
+    global main_pid, directory
+    main_pid = os.getpid()
+    directory = Path(app.doctreedir, "render-cache")
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("*.jsonl"):
+        stale.unlink()
+    entries.clear()
+    counters.clear()
+    cache = directory / "cache.pickle"
+    if not cache.is_file():
+        return
+    try:
+        stored = pickle.loads(cache.read_bytes())  # noqa: S301
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return
+    if stored.get("fingerprint") == fingerprint():
+        entries.update(stored.get("entries", {}))
+
+
+def build_finished(_: Sphinx, exc: Exception | None) -> None:
+    """Merge the workers' lookups, persist the cache, and log its hit
+    rates.
+
+    :param _: The Sphinx application instance (unused).
+    :param exc: An exception raised during the build process, or `None`
+        if the build was successful.
+    """
+    if directory is None:
+        return
+    for path in sorted(directory.glob("*.jsonl")):
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                lookup = json.loads(line)
+                hit = lookup["html"] is None
+                count(lookup["name"], hit=hit)
+                if not hit:
+                    entries[lookup["key"]] = lookup["html"]
+        path.unlink()
+    while len(entries) > size:
+        entries.popitem(last=False)
+    if not exc:
+        (directory / "cache.pickle").write_bytes(
+            pickle.dumps({"fingerprint": fingerprint(), "entries": entries})
+        )
+    for name, (hits, misses) in sorted(counters.items()):
+        logger.info(
+            "Render cache for %s: %d hits, %d misses (%.0f%% hit rate)",
+            name,
+            hits,
+            misses,
+            100 * hits / (hits + misses),
+        )
+    counters.clear()
@@ -0,0 +1,110 @@
+"""\
+Page Features
+=============
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module records which of the theme's on-demand script modules each
+page needs, so that `theme.js` only imports those.
+
+The behaviour of the components which only some pages have, e.g., the
+zoomable figures or the YouTube cards, lives in ES modules under
+`_static/modules` rather than in `theme.js`. While writing a page, its
+doctree is walked once and the features found are added to the page's
+context as `features`. The layout then preloads their modules and lists
+them in the `data-features` attribute, which `theme.js` reads to import
+them.
+
+A directive declares the feature its nodes need with a module-level
+`feature` attribute, naming the module to load, e.g., `youtube`.
+
+.. versionchanged:: 19.10.2026
+
+    The same walk collects the third-party origins of the directives,
+    from which the page's resource hints are planned (see `hints`).
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+import docutils.nodes as nodes
+
+from theme.extensions import directives
+from theme.extensions import hints
+from theme.extensions import picture
+from theme.extensions.utils import findall
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+
+    from sphinx.application import Sphinx
+
+    from theme.extensions.hints import Origin
+
+zoomable: t.Final[tuple[type[nodes.Element], ...]] = (
+    nodes.figure,
+    nodes.image,
+    picture.node,
+)
+provided: dict[type[nodes.Element], str] = {
+    directive.node: directive.feature
+    for directive in directives
+    if hasattr(directive, "feature")
+}
+connecting: dict[type[nodes.Element], Callable[..., Iterable[Origin]]] = {
+    directive.node: directive.origins
+    for directive in directives
+    if hasattr(directive, "origins")
+}
+
+
+def detect(doctree: nodes.document) -> tuple[list[str], list[Origin]]:
+    """Return the features and the third-party origins used by a
+    document.
+
+    :param doctree: The resolved doctree of the page.
+    :return: Names of the feature modules, sorted, and the origins, in
+        the order they appear in the document.
+    """
+    found: set[str] = set()
+    origins: dict[Origin, None] = {}
+    for node in findall(doctree, nodes.Element):
+        kind = type(node)
+        if kind in provided:
+            found.add(provided[kind])
+        if kind in connecting:
+            origins.update(dict.fromkeys(connecting[kind](node)))
+        if isinstance(node, zoomable) and "zoom" in (
+            *node["classes"],
+            *node.get("figclass", ()),
+        ):
+            found.add("zoom")
+    return sorted(found), list(origins)
+
+
+def html_page_context(
+    _: Sphinx,
+    __: str,
+    ___: str,
+    context: dict[str, t.Any],
+    doctree: nodes.document | None,
+) -> None:
+    """Add the features used by the page, along with its resource
+    hints, to its context.
+
+    The pages without a doctree, e.g., the search page or the index,
+    use none of the features and connect to no directive's origin.
+
+    :param _: The Sphinx application instance (unused).
+    :param __: Name of the page being rendered (unused).
+    :param ___: Name of the page's template (unused).
+    :param context: The page's template context.
+    :param doctree: The page's doctree, if any.
+    """
+    features, origins = detect(doctree) if doctree is not None else ([], [])
+    context["features"] = features
+    context["resource_hints"] = hints.plan(context, origins)
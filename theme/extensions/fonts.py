@@ -0,0 +1,291 @@
+"""\
+Geist Font Subsetting
+=====================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module self-hosts subsets of the Geist faces declared in the
+theme's `geist.css` in place of the full fonts served from jsDelivr.
+
+Once the Sphinx build has finished, it collects every character used
+in the text of the generated pages, downloads each face referenced by
+the stylesheet (once, as they're cached in the doctree directory), and
+subsets them to the matching glyphs using `fontTools`. The stylesheet
+in the output directory is then rewritten to point to the local WOFF2
+files along with a `unicode-range` describing exactly the characters
+each subset covers, so the browsers never request a face for a page
+which doesn't need it.
+
+The faces are downloaded when the builder is initialised, before any
+page is written, so that the pages only preload the local files of the
+faces which will be written (see `hints`). The faces written are kept
+in the build environment, and every page is written again if they
+aren't the same as in the previous build.
+
+This is an opt-in feature and can be enabled by setting `subset_fonts`
+in the `html_context`. The faces that are preloaded by every page can
+be configured using `preload_fonts`, and default to the regular and
+semibold weights of Geist Sans, which render the body and headings.
+
+.. note::
+
+    Faces which cannot be downloaded are reported as `theme.fonts`
+    warnings and are left pointing to jsDelivr, from where the pages
+    keep preloading them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import os.path as p
+import re
+import typing as t
+import urllib.request
+from pathlib import Path
+
+from fontTools.ttLib import TTFont
+from sphinx.util import logging
+
+from theme.extensions.icons import rules
+from theme.extensions.icons import subset_font
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from sphinx.application import Sphinx
+    from sphinx.environment import BuildEnvironment
+
+logger = logging.getLogger(__name__)
+
+stylesheet: t.Final[str] = "_static/geist.css"
+fonts: t.Final[str] = "_static/fonts"
+timeout: t.Final[int] = 30
+here: str = p.dirname(__file__)
+theme_stylesheet = Path(p.abspath(p.join(here, "../base/static/geist.css")))
+
+# NOTE: The downloaded face of each name, or `None` if its download
+# failed, in which case it's left pointing to jsDelivr.
+sources: dict[str, Path | None] = {}
+
+# NOTE: Printable ASCII is always kept in the subsets as the theme's
+# scripts generate a few strings (tooltips, reading time, etc.) which
+# are not part of the generated pages.
+ascii_printable: t.Final[set[int]] = set(range(0x20, 0x7F))
+
+COMMENT_RE: re.Pattern[str] = re.compile(r"(?s)/\*.*?\*/")
+SKIPPED_RE: re.Pattern[str] = re.compile(
+    r"(?is)<(script|style|template)\b[^>]*>.*?</\1\s*>"
+)
+TAG_RE: re.Pattern[str] = re.compile(r"(?s)<[^>]*>")
+URL_RE: re.Pattern[str] = re.compile(r"url\(\s*[\"']?([^\"')]+\.woff2)")
+DECLARATION_RE: re.Pattern[str] = re.compile(
+    r"^([a-z-]+)\s*:\s*(.+)$", re.DOTALL
+)
+
+
+def used_characters(outdir: Path) -> set[int]:
+    """Collect the characters rendered by the generated pages.
+
+    The markup, scripts, and stylesheets are dropped and the entities
+    are unescaped before the text is collected.
+
+    :param outdir: The output directory of the current build.
+    :return: A set of codepoints.
+    """
+    found: set[int] = set(ascii_printable)
+    for page in outdir.rglob("*.html"):
+        text = page.read_text(encoding="utf-8", errors="ignore")
+        text = html.unescape(TAG_RE.sub(" ", SKIPPED_RE.sub(" ", text)))
+        found.update(map(ord, text))
+    return {_ for _ in found if _ >= 0x20}
+
+
+def unicode_range(codepoints: Iterable[int]) -> str:
+    """Compress codepoints to a CSS `unicode-range` descriptor value.
+
+    :param codepoints: Codepoints covered by the font.
+    :return: Comma separated ranges, e.g., `U+20-7E, U+2014`.
+    """
+    ranges: list[list[int]] = []
+    for codepoint in sorted(codepoints):
+        if ranges and ranges[-1][1] + 1 == codepoint:
+            ranges[-1][1] = codepoint
+        else:
+            ranges.append([codepoint, codepoint])
+    return ", ".join(
+        f"U+{start:X}" if start == end else f"U+{start:X}-{end:X}"
+        for start, end in ranges
+    )
+
+
+def declarations(body: str) -> dict[str, str]:
+    """Parse the declarations of a CSS rule into a mapping."""
+    parsed: dict[str, str] = {}
+    for declaration in filter(None, map(str.strip, body.split(";"))):
+        match = DECLARATION_RE.match(declaration)
+        if match:
+            parsed[match.group(1).lower()] = match.group(2).strip()
+    return parsed
+
+
+def face_name(descriptors: dict[str, str]) -> str:
+    """Return a stable file name for a font face, e.g.,
+    `geist-sans-400-normal`.
+    """
+    family = descriptors.get("font-family", "font").strip("\"' ")
+    return "-".join(
+        (
+            "-".join(family.lower().split()),
+            descriptors.get("font-weight", "400"),
+            descriptors.get("font-style", "normal"),
+        )
+    )
+
+
+def download(url: str, cache: Path) -> Path:
+    """Download a font, unless it's already cached.
+
+    :param url: URL of the font.
+    :param cache: Directory to cache the downloaded fonts.
+    :return: Path of the cached font.
+    """
+    cached = cache / f"{hashlib.sha256(url.encode()).hexdigest()[:16]}.woff2"
+    if not cached.is_file():
+        with urllib.request.urlopen(url, timeout=timeout) as resp:  # noqa: S310
+            data = resp.read()
+        cache.mkdir(parents=True, exist_ok=True)
+        cached.write_bytes(data)
+    return cached
+
+
+def fetch(url: str, name: str, cache: Path) -> Path | None:
+    """Download a face once per build, reporting the failures.
+
+    :param url: URL of the face.
+    :param name: File name of the face, e.g., `geist-sans-400-normal`.
+    :param cache: Directory to cache the downloaded fonts.
+    :return: Path of the cached face, or `None` if it couldn't be
+        downloaded.
+    """
+    if name not in sources:
+        try:
+            sources[name] = download(url, cache)
+        except OSError as err:
+            logger.warning(
+                "Failed to download font %s: %s",
+                url,
+                err,
+                type="theme",
+                subtype="fonts",
+            )
+            sources[name] = None
+    return sources[name]
+
+
+def faces(text: str) -> Iterator[tuple[str, str, str | None]]:
+    """Yield the rules of a stylesheet along with the URL of the face
+    they declare, if any.
+    """
+    for prelude, body in rules(COMMENT_RE.sub("", text)):
+        match = URL_RE.search(body)
+        if prelude != "@font-face" or not match:
+            yield prelude, body, None
+        else:
+            yield prelude, body, match.group(1)
+
+
+def local() -> set[str]:
+    """Return the names of the faces which are written to the output."""
+    return {name for name, src in sources.items() if src}
+
+
+def builder_inited(app: Sphinx) -> None:
+    """Download the Geist faces before the pages are written.
+
+    :param app: The Sphinx application instance.
+    """
+    sources.clear()
+    if (
+        app.builder.name not in {"html", "dirhtml"}
+        or not app.config.html_context.get("subset_fonts")
+        or not theme_stylesheet.is_file()
+    ):
+        return
+    cache = Path(app.doctreedir, "fonts", "sources")
+    for _, body, url in faces(theme_stylesheet.read_text("utf-8")):
+        if url:
+            fetch(url, face_name(declarations(body)), cache)
+
+
+def env_get_outdated(
+    _: Sphinx,
+    env: BuildEnvironment,
+    __: set[str],
+    ___: set[str],
+    ____: set[str],
+) -> list[str]:
+    """Return every document if the faces written to the output aren't
+    the same as in the previous build, as their pages preload them.
+
+    :param _: The Sphinx application instance (unused).
+    :param env: The build environment.
+    :param __: Names of the added documents (unused).
+    :param ___: Names of the changed documents (unused).
+    :param ____: Names of the removed documents (unused).
+    :return: Names of the documents to read and write again.
+    """
+    written = sorted(local())
+    if getattr(env, "theme_fonts", None) == written:
+        return []
+    env.theme_fonts = written
+    return sorted(env.all_docs)
+
+
+def build_finished(app: Sphinx, exc: Exception | None) -> None:
+    """Write the subset Geist faces and the rewritten stylesheet.
+
+    :param app: The Sphinx application instance.
+    :param exc: An exception raised during the build process, or `None`
+        if the build was successful.
+    """
+    if (
+        exc
+        or app.builder.name not in {"html", "dirhtml"}
+        or not app.config.html_context.get("subset_fonts")
+    ):
+        return
+    outdir = Path(app.outdir)
+    css = outdir / stylesheet
+    if not css.is_file():
+        return
+    used = used_characters(outdir)
+    cache = Path(app.doctreedir, "fonts")
+    kept: list[str] = []
+    written = total = 0
+    for prelude, body, url in faces(css.read_text("utf-8")):
+        descriptors = declarations(body)
+        name = face_name(descriptors)
+        src = fetch(url, name, cache / "sources") if url else None
+        total += bool(url)
+        if src is None:
+            kept.append(f"{prelude} {{ {' '.join(body.split())} }}")
+            continue
+        with TTFont(src) as font:
+            unicodes = used & set(font.getBestCmap())
+        subset_font(src, outdir / fonts / f"{name}.woff2", unicodes, cache)
+        descriptors["src"] = f'url("fonts/{name}.woff2") format("woff2")'
+        descriptors["unicode-range"] = unicode_range(unicodes)
+        body = "; ".join(f"{k}: {v}" for k, v in descriptors.items())
+        kept.append(f"{prelude} {{ {body}; }}")
+        written += 1
+    css.write_text("\n".join(kept) + "\n", encoding="utf-8")
+    logger.info(
+        "Geist fonts: subset %d of %d faces to %d characters",
+        written,
+        total,
+        len(used),
+    )
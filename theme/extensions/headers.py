@@ -0,0 +1,291 @@
+"""\
+Cache Headers
+=============
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module describes the caching policy of every file in the output,
+so that the static host doesn't serve the whole website with the same
+policy.
+
+Once the Sphinx build has finished, every file of the output is given
+one of the following policies::
+
+    [1] Fingerprinted files, i.e., the files whose name carries a
+        content hash or which the pages only reference with Sphinx's
+        `?v=` checksum, are cached for a year as `immutable`.
+    [2] Images and fonts are cached for a day and revalidated in the
+        background for a week after that.
+    [3] Everything else, i.e., the pages and the unversioned scripts
+        and stylesheets, is revalidated on every request. The pages
+        also carry `Link: rel=preload` headers for the stylesheets and
+        the fonts preloaded by the root page, which the hosts that
+        support it turn into early hints.
+
+The policies are written as a `_headers` file, which Netlify and
+Cloudflare Pages read, and as an equivalent `_headers.nginx` include
+of `location` blocks for the nginx `server`. A directory whose files
+share the same policy is written as one rule, the rest as one rule per
+file, so no file ever matches two rules.
+
+This is an opt-in feature and can be enabled by setting `cache_headers`
+in the `html_context`.
+
+.. note::
+
+    nginx doesn't inherit the `add_header` directives of the `server`
+    in a `location` which declares its own, so any other headers set
+    at the `server` level have to be repeated in the locations of the
+    include.
+"""
+
+from __future__ import annotations
+
+import collections
+import posixpath
+import re
+import typing as t
+import urllib.parse
+from pathlib import Path
+
+import bs4
+from sphinx.util import logging
+
+if t.TYPE_CHECKING:
+    from sphinx.application import Sphinx
+
+    Headers = tuple[tuple[str, str], ...]
+
+logger = logging.getLogger(__name__)
+
+name: t.Final[str] = "_headers"
+nginx: t.Final[str] = "_headers.nginx"
+immutable: t.Final[str] = "public, max-age=31536000, immutable"
+cached: t.Final[str] = "public, max-age=86400, stale-while-revalidate=604800"
+revalidate: t.Final[str] = "public, max-age=0, must-revalidate"
+media: t.Final[frozenset[str]] = frozenset(
+    {
+        ".avif",
+        ".gif",
+        ".ico",
+        ".jpeg",
+        ".jpg",
+        ".otf",
+        ".png",
+        ".svg",
+        ".ttf",
+        ".webp",
+        ".woff",
+        ".woff2",
+    }
+)
+
+FINGERPRINT_RE: re.Pattern[str] = re.compile(r"[._-][0-9a-f]{8,}\.\w+$")
+VERSIONED_RE: re.Pattern[str] = re.compile(
+    r"""(?:href|src)=["']?([^"'\s>?#]+)\?v=[0-9a-f]+"""
+)
+
+
+def files(outdir: Path) -> list[str]:
+    """Return the files of the output, relative to it and sorted.
+
+    The hidden files and directories (e.g., the doctrees kept in the
+    output by the development server) and the manifests themselves are
+    left out.
+    """
+    found: list[str] = []
+    for path in outdir.rglob("*"):
+        relative = path.relative_to(outdir).as_posix()
+        if (
+            path.is_file()
+            and relative not in {name, nginx}
+            and not any(part.startswith(".") for part in relative.split("/"))
+        ):
+            found.append(relative)
+    return sorted(found)
+
+
+def versioned(outdir: Path, pages: t.Iterable[str]) -> set[str]:
+    """Return the files which the pages reference with a checksum.
+
+    :param outdir: The output directory of the current build.
+    :param pages: The pages of the output, relative to it.
+    :return: Paths of the referenced files, relative to the output.
+    """
+    found: set[str] = set()
+    for page in pages:
+        here = posixpath.dirname(page)
+        text = (outdir / page).read_text(encoding="utf-8", errors="ignore")
+        for url in VERSIONED_RE.findall(text):
+            if urllib.parse.urlsplit(url).netloc or url.startswith("/"):
+                continue
+            found.add(posixpath.normpath(posixpath.join(here, url)))
+    return found
+
+
+def early_hints(outdir: Path, root: str, prefix: str) -> list[str]:
+    """Return the `Link` headers preloading the critical assets.
+
+    The stylesheets and the preloaded fonts are the same for every
+    page, hence they're read from the root page.
+
+    :param outdir: The output directory of the current build.
+    :param root: The root page, relative to the output.
+    :param prefix: Path of the website's root, e.g., `/`.
+    :return: Values of the `Link` headers.
+    """
+    page = outdir / root
+    if not page.is_file():
+        return []
+    tree = bs4.BeautifulSoup(page.read_text(encoding="utf-8"), "html.parser")
+    here = posixpath.dirname(root)
+    links: list[str] = []
+    for link in tree.find_all("link", href=True):
+        rel: list[str] | str = link.get("rel") or []
+        href = link["href"]
+        if urllib.parse.urlsplit(href).netloc:
+            continue
+        path = prefix + posixpath.normpath(posixpath.join(here, href))
+        if "stylesheet" in rel:
+            links.append(f"<{path}>; rel=preload; as=style")
+        elif "preload" in rel and link.get("as") == "font":
+            links.append(
+                f"<{path}>; rel=preload; as=font; type=font/woff2; crossorigin"
+            )
+    return links
+
+
+def policy(
+    path: str,
+    fingerprinted: set[str],
+    links: list[str],
+) -> Headers:
+    """Return the headers of a file of the output.
+
+    :param path: Path of the file, relative to the output.
+    :param fingerprinted: Files referenced with a checksum.
+    :param links: `Link` headers of the pages.
+    :return: Pairs of the header names and values.
+    """
+    suffix = posixpath.splitext(path)[1].lower()
+    if path in fingerprinted or FINGERPRINT_RE.search(path):
+        return (("Cache-Control", immutable),)
+    if suffix in media:
+        return (("Cache-Control", cached),)
+    if suffix == ".html":
+        return (
+            ("Cache-Control", revalidate),
+            *(("Link", link) for link in links),
+        )
+    return (("Cache-Control", revalidate),)
+
+
+def rules(policies: dict[str, Headers]) -> list[tuple[str, Headers]]:
+    """Group the files sharing a policy into as few rules as possible.
+
+    A directory whose files (at any depth) all share one policy becomes
+    a single rule, e.g., `_static/fonts/*`; the files of the other
+    directories get a rule each. The root directory is never grouped,
+    as its rule would match every path of the website.
+
+    :param policies: Headers of every file, keyed by its path.
+    :return: Paths (relative to the output) and their headers, where a
+        trailing `*` matches everything under a directory.
+    """
+    within: dict[str, set[Headers]] = collections.defaultdict(set)
+    for path, headers in policies.items():
+        parent = posixpath.dirname(path)
+        while parent:
+            within[parent].add(headers)
+            parent = posixpath.dirname(parent)
+    grouped: list[tuple[str, Headers]] = []
+    done: set[str] = set()
+    for path, headers in policies.items():
+        parents = []
+        parent = posixpath.dirname(path)
+        while parent:
+            parents.append(parent)
+            parent = posixpath.dirname(parent)
+        uniform = [_ for _ in parents if len(within[_]) == 1]
+        if uniform:
+            top = uniform[-1]
+            if top not in done:
+                done.add(top)
+                grouped.append((f"{top}/*", headers))
+            continue
+        grouped.append((path, headers))
+        if posixpath.basename(path) == "index.html":
+            grouped.append((path[: -len("index.html")], headers))
+    return grouped
+
+
+def netlify(grouped: list[tuple[str, Headers]], prefix: str) -> str:
+    """Render the rules in the `_headers` format."""
+    blocks = []
+    for path, headers in grouped:
+        lines = [prefix + path]
+        lines.extend(f"  {header}: {value}" for header, value in headers)
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+def locations(grouped: list[tuple[str, Headers]], prefix: str) -> str:
+    """Render the rules as nginx `location` blocks.
+
+    The directories are matched by prefix, taking precedence over the
+    regular expression locations of the `server`, the files exactly.
+    """
+    blocks = []
+    for path, headers in grouped:
+        if path.endswith("/*"):
+            match = f"^~ {prefix}{path[:-1]}"
+        elif not path or path.endswith("/"):
+            continue
+        else:
+            match = f"= {prefix}{path}"
+        lines = [f"location {match} {{"]
+        lines.extend(
+            f'    add_header {header} "{value}" always;'
+            for header, value in headers
+        )
+        lines.append("}")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+def build_finished(app: Sphinx, exc: Exception | None) -> None:
+    """Write the `_headers` file and the nginx include to the root of
+    the output directory.
+
+    :param app: The Sphinx application instance.
+    :param exc: An exception raised during the build process, or `None`
+        if the build was successful.
+    """
+    if (
+        exc
+        or app.builder.name not in {"html", "dirhtml"}
+        or not app.config.html_context.get("cache_headers")
+    ):
+        return
+    outdir = Path(app.outdir)
+    prefix = urllib.parse.urlsplit(app.config.html_baseurl).path or "/"
+    prefix = prefix if prefix.endswith("/") else f"{prefix}/"
+    paths = files(outdir)
+    pages = [path for path in paths if path.endswith(".html")]
+    fingerprinted = versioned(outdir, pages)
+    root = app.builder.get_target_uri(app.config.root_doc) or "index.html"
+    if root.endswith("/"):
+        root += "index.html"
+    links = early_hints(outdir, root, prefix)
+    policies = {path: policy(path, fingerprinted, links) for path in paths}
+    grouped = rules(policies)
+    (outdir / name).write_text(netlify(grouped, prefix), encoding="utf-8")
+    (outdir / nginx).write_text(locations(grouped, prefix), encoding="utf-8")
+    logger.info(
+        "Cache headers: %d rules for %d files (%d immutable)",
+        len(grouped),
+        len(paths),
+        sum(headers[0][1] == immutable for headers in policies.values()),
+    )
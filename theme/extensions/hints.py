@@ -0,0 +1,123 @@
+"""\
+Resource Hints
+==============
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module plans the `preconnect`, `dns-prefetch`, and `preload`
+hints of every page, so that the browser sets up the connections the
+page will need while it's still parsing the HTML.
+
+The hints are planned from what the page is known to use at build
+time, rather than a fixed list in the layout:
+
+- The origins of the page's directives, e.g., the YouTube player or
+  the GitHub API. A directive lists them with a module-level `origins`
+  function, which receives its node and returns the origins along with
+  whether they're requested in CORS mode (see `features`).
+- The Font Awesome kit, unless the icons are self-hosted.
+- The faces to preload, from the output if they're subset and written
+  there (see `fonts`), otherwise from jsDelivr, which is preconnected
+  unless every face is self-hosted.
+- The `third_party_scripts`, which only get a `dns-prefetch` as they
+  load late anyway.
+
+Only the first few origins are preconnected, as each connection set up
+in vain competes with the ones the page does need; the rest only get a
+`dns-prefetch`.
+"""
+
+from __future__ import annotations
+
+import typing as t
+import urllib.parse
+
+from theme.extensions import fonts
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    Origin = tuple[str, bool]
+
+limit: t.Final[int] = 4
+kit: t.Final[tuple[Origin, ...]] = (
+    ("https://kit.fontawesome.com", False),
+    ("https://ka-p.fontawesome.com", True),
+)
+jsdelivr: t.Final[str] = "https://cdn.jsdelivr.net"
+faces: t.Final[str] = f"{jsdelivr}/fontsource/fonts"
+preloaded: t.Final[list[str]] = [
+    "geist-sans-400-normal",
+    "geist-sans-600-normal",
+]
+
+
+def origin(url: str) -> str | None:
+    """Return the origin of an absolute (or protocol-relative) URL.
+
+    :param url: URL of a resource.
+    :return: The origin, e.g., `https://api.github.com`, or `None` if
+        the URL is relative to the site.
+    """
+    parsed = urllib.parse.urlsplit(url, scheme="https")
+    if parsed.scheme not in {"http", "https"} or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def face(name: str) -> str:
+    """Return the jsDelivr URL of a Geist face, e.g., for the name
+    `geist-sans-400-normal`.
+    """
+    family, weight, style = name.rsplit("-", 2)
+    return f"{faces}/{family}@latest/latin-{weight}-{style}.woff2"
+
+
+def plan(
+    context: dict[str, t.Any],
+    origins: Iterable[Origin],
+) -> list[dict[str, str]]:
+    """Return the resource hints of a page.
+
+    :param context: The page's template context.
+    :param origins: Origins used by the page's directives, in the order
+        they appear on the page.
+    :return: Attributes of the `link` elements to emit, in order.
+    """
+    local = fonts.local() if context.get("subset_fonts") else set()
+    connections: dict[Origin, None] = {}
+    if not context.get("font_awesome"):
+        connections.update(dict.fromkeys(kit))
+    if not local or None in fonts.sources.values():
+        connections[(jsdelivr, True)] = None
+    connections.update(dict.fromkeys(origins))
+    hints: list[dict[str, str]] = []
+    for index, (href, cors) in enumerate(connections):
+        hint = {"rel": "preconnect" if index < limit else "dns-prefetch"}
+        hint["href"] = href
+        if cors:
+            hint["crossorigin"] = "anonymous"
+        hints.append(hint)
+    seen = {href for href, _ in connections}
+    for script in context.get("third_party_scripts") or ():
+        href = origin(script.get("src", ""))
+        if href and href not in seen:
+            seen.add(href)
+            hints.append({"rel": "dns-prefetch", "href": href})
+    hints.extend(
+        {
+            "rel": "preload",
+            "href": (
+                context["pathto"](f"{fonts.fonts}/{name}.woff2", 1)
+                if name in local
+                else face(name)
+            ),
+            "as": "font",
+            "type": "font/woff2",
+            "crossorigin": "anonymous",
+        }
+        for name in context.get("preload_fonts") or preloaded
+    )
+    return hints
@@ -0,0 +1,270 @@
+"""\
+Font Awesome Subsetting
+=======================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module self-hosts a subset of Font Awesome in place of the kit
+script loaded from `kit.fontawesome.com`.
+
+Once the Sphinx build has finished, it collects every `fa-*` class used
+across the generated pages, the theme's templates and scripts, along
+with the icons referenced by the theme's stylesheets through their
+codepoints. It then writes a trimmed copy of the Font Awesome
+stylesheet which only carries the rules for those icons, and subsets
+the webfonts to the matching glyphs using `fontTools`.
+
+This is an opt-in feature and can be enabled by setting `font_awesome`
+in the `html_context` to the path (relative to `conf.py`) of a Font
+Awesome "For the Web" download, i.e., a directory containing the
+`css/all.css` stylesheet and its `webfonts` directory.
+
+.. note::
+
+    Icons which are not part of the download, e.g., custom kit icons,
+    are reported as `theme.icons` warnings and can be silenced using
+    Sphinx's `suppress_warnings` option.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os.path as p
+import re
+import shutil
+import typing as t
+from pathlib import Path
+
+from fontTools import subset
+from sphinx.util import logging
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sphinx.application import Sphinx
+
+logger = logging.getLogger(__name__)
+
+here: str = p.dirname(__file__)
+theme_dirs: t.Sequence[str] = (
+    p.abspath(p.join(here, "../base/templates")),
+    p.abspath(p.join(here, "../base/static")),
+)
+stylesheet: t.Final[str] = "_static/fontawesome/css/fontawesome.css"
+webfonts: t.Final[str] = "_static/fontawesome/webfonts"
+
+CLASS_RE: re.Pattern[str] = re.compile(
+    r"""\bclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'`>]+))"""
+)
+ICON_CLASS_RE: re.Pattern[str] = re.compile(r"^fa-[a-z0-9-]+$")
+FA_CLASS_RE: re.Pattern[str] = re.compile(r"\.(fa-[a-z0-9-]+)")
+ICON_SELECTOR_RE: re.Pattern[str] = re.compile(
+    r"^\.(fa-[a-z0-9-]+)(?:::?before)?$"
+)
+ICON_DECLARATION_RE: re.Pattern[str] = re.compile(
+    r"^(?:content|--fa[a-z-]*)\s*:\s*\"([^\"]*)\"$"
+)
+CODEPOINT_RE: re.Pattern[str] = re.compile(r"\\([0-9a-fA-F]{1,6})")
+WOFF2_RE: re.Pattern[str] = re.compile(r"url\(\s*[\"']?([^\"')]+\.woff2)")
+COMMENT_RE: re.Pattern[str] = re.compile(r"/\*(?!!).*?\*/", re.DOTALL)
+BANNER_RE: re.Pattern[str] = re.compile(r"/\*!.*?\*/", re.DOTALL)
+
+
+def rules(css: str) -> Iterator[tuple[str, str]]:
+    """Split a stylesheet into its top-level rules.
+
+    Nested blocks, such as the ones in `@media` or `@keyframes`
+    at-rules, are returned verbatim as the body of their parent rule.
+
+    :param css: Stylesheet without comments.
+    :yield: Tuples of prelude (selectors or at-rule) and body.
+    """
+    depth = start = 0
+    prelude = ""
+    for idx, char in enumerate(css):
+        if char == "{":
+            if depth == 0:
+                prelude = css[start:idx].strip()
+                start = idx + 1
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                yield prelude, css[start:idx].strip()
+                start = idx + 1
+
+
+def icon_rule(prelude: str, body: str) -> tuple[list[str], str] | None:
+    """Check whether a rule only maps icon classes to their glyphs.
+
+    :param prelude: Selectors of the rule.
+    :param body: Declarations of the rule.
+    :return: A tuple of icon names and the glyph string if the rule is
+        an icon rule, `None` otherwise.
+    """
+    names: list[str] = []
+    for selector in prelude.split(","):
+        match = ICON_SELECTOR_RE.match(selector.strip())
+        if not match:
+            return None
+        names.append(match.group(1))
+    glyphs = ""
+    for declaration in filter(None, map(str.strip, body.split(";"))):
+        match = ICON_DECLARATION_RE.match(declaration)
+        if not match:
+            return None
+        glyphs += match.group(1)
+    return names, glyphs
+
+
+def codepoints(text: str) -> set[int]:
+    """Return the codepoints escaped in a CSS string."""
+    return {int(_, 16) for _ in CODEPOINT_RE.findall(text)}
+
+
+def used_classes(outdir: Path) -> set[str]:
+    """Collect the `fa-*` classes used by the website.
+
+    The generated pages, theme templates, and theme scripts are scanned
+    for `class` attributes (including the ones built as strings in
+    Javascript), whether quoted or not, as the minified pages drop the
+    quotes around single classes.
+
+    :param outdir: The output directory of the current build.
+    :return: A set of `fa-*` class names.
+    """
+    files = list(outdir.rglob("*.html"))
+    for directory in theme_dirs:
+        files.extend(Path(directory).glob("*.js"))
+        files.extend(Path(directory).glob("*.html*"))
+    classes: set[str] = set()
+    for file in files:
+        text = file.read_text(encoding="utf-8", errors="ignore")
+        for groups in CLASS_RE.findall(text):
+            value = "".join(groups)
+            classes.update(_ for _ in value.split() if ICON_CLASS_RE.match(_))
+    return classes
+
+
+def used_codepoints(outdir: Path) -> set[int]:
+    """Collect the Font Awesome glyphs used in the built stylesheets.
+
+    The theme draws a few icons through `::before` and `::after` pseudo
+    elements using their codepoints, which all live in the private use
+    area of the font.
+
+    :param outdir: The output directory of the current build.
+    :return: A set of codepoints.
+    """
+    found: set[int] = set()
+    for css in (outdir / "_static").glob("*.css"):
+        found |= codepoints(css.read_text(encoding="utf-8", errors="ignore"))
+    return {_ for _ in found if 0xE000 <= _ <= 0xF8FF}
+
+
+def subset_font(src: Path, dest: Path, unicodes: set[int], cache: Path) -> None:
+    """Subset a webfont to the given codepoints and save it as WOFF2.
+
+    The subset fonts are cached by the digest of the source font and
+    the requested codepoints so that consecutive builds do not subset
+    the same font again.
+
+    :param src: Path of the original webfont.
+    :param dest: Path where the subset webfont is written.
+    :param unicodes: Codepoints to keep in the subset.
+    :param cache: Directory to cache the subset fonts.
+    """
+    key = hashlib.sha256(src.read_bytes())
+    key.update(",".join(map(str, sorted(unicodes))).encode())
+    cached = cache / f"{key.hexdigest()[:16]}.woff2"
+    if not cached.is_file():
+        options = subset.Options()
+        options.flavor = "woff2"
+        font = subset.load_font(str(src), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=unicodes)
+        subsetter.subset(font)
+        cache.mkdir(parents=True, exist_ok=True)
+        subset.save_font(font, str(cached), options)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(cached, dest)
+
+
+def build_finished(app: Sphinx, exc: Exception | None) -> None:
+    """Write the trimmed Font Awesome stylesheet and subset webfonts.
+
+    :param app: The Sphinx application instance.
+    :param exc: An exception raised during the build process, or `None`
+        if the build was successful.
+    """
+    download = app.config.html_context.get("font_awesome")
+    if exc or app.builder.name not in {"html", "dirhtml"} or not download:
+        return
+    source = Path(app.confdir, download, "css", "all.css")
+    if not source.is_file():
+        logger.warning(
+            "Font Awesome stylesheet not found: %s",
+            source,
+            type="theme",
+            subtype="icons",
+        )
+        return
+    outdir = Path(app.outdir)
+    text = source.read_text(encoding="utf-8")
+    banners = BANNER_RE.findall(text)
+    classes = used_classes(outdir)
+    unicodes = used_codepoints(outdir)
+    known: set[str] = set(FA_CLASS_RE.findall(text))
+    kept: list[str] = []
+    fonts: list[str] = []
+    for prelude, body in rules(COMMENT_RE.sub("", BANNER_RE.sub("", text))):
+        icon = icon_rule(prelude, body)
+        if icon:
+            names, glyphs = icon
+            selectors = prelude.split(",")
+            selectors = [
+                selector.strip()
+                for name, selector in zip(names, selectors, strict=True)
+                if name in classes
+            ]
+            if not selectors:
+                continue
+            unicodes |= codepoints(glyphs)
+            prelude = ",".join(selectors)
+        elif prelude == "@font-face":
+            match = WOFF2_RE.search(body)
+            if not match:
+                continue
+            fonts.append(match.group(1))
+            body = re.sub(
+                r"src\s*:[^;]+",
+                f'src: url("{match.group(1)}") format("woff2")',
+                body,
+            )
+        kept.append(f"{prelude}{{{' '.join(body.split())}}}")
+    cache = Path(app.doctreedir, "fontawesome")
+    for font in fonts:
+        src = (source.parent / font).resolve()
+        dest = outdir / webfonts / p.basename(font)
+        subset_font(src, dest, unicodes, cache)
+    css = outdir / stylesheet
+    css.parent.mkdir(parents=True, exist_ok=True)
+    css.write_text("\n".join([*banners, *kept]) + "\n", encoding="utf-8")
+    missing = sorted(
+        _ for _ in classes - known if not _.startswith("fa-sr-only")
+    )
+    if missing:
+        logger.warning(
+            "Font Awesome icons not found in %s: %s",
+            download,
+            ", ".join(missing),
+            type="theme",
+            subtype="icons",
+        )
+    logger.info(
+        "Font Awesome: kept %d glyphs across %d webfonts",
+        len(unicodes),
+        len(fonts),
+    )
@@ -0,0 +1,246 @@
+"""\
+Image Attributes
+================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module adds the intrinsic dimensions and the loading hints to the
+images of the generated pages, whichever directive produced them, e.g.,
+`image`, `figure`, `picture`, or the carousel's slides.
+
+While post-processing a page, the `width` and the `height` of every
+local image without them are read from the image's header, so that the
+browser reserves its space before it has downloaded it. The images of
+the article are then loaded lazily and decoded off the main thread,
+except for the first one near the top of the article, which is likely
+to be the largest paint of the page and is fetched with a high
+priority instead.
+
+The headers of PNG, JPEG, GIF, and WebP images are parsed directly, and
+SVG images are sized using their `width` and `height`, or `viewBox`.
+The dimensions are cached by the file's path, size, and modification
+time, so an image shown on many pages is only read once.
+"""
+
+from __future__ import annotations
+
+import os
+import os.path as p
+import re
+import struct
+import typing as t
+import urllib.parse
+
+if t.TYPE_CHECKING:
+    import bs4
+
+    Size = tuple[int, int]
+
+# NOTE: The first image is only considered above the fold if there's
+# less text than roughly a screenful before it in the article, and
+# unless it's known to be as small as an icon or an avatar.
+fold: t.Final[int] = 600
+small: t.Final[int] = 96
+
+frames: t.Final[frozenset[int]] = frozenset(range(0xC0, 0xD0)) - {
+    0xC4,
+    0xC8,
+    0xCC,
+}
+standalone: t.Final[frozenset[int]] = frozenset({0x01, *range(0xD0, 0xD9)})
+
+SVG_RE: re.Pattern[bytes] = re.compile(rb"<svg\b[^>]*>", re.IGNORECASE)
+LENGTH_RE: re.Pattern[str] = re.compile(r"^\s*([\d.]+)\s*(px)?\s*$")
+
+sizes: dict[tuple[str, int, int], Size | None] = {}
+
+
+def jpeg(f: t.BinaryIO) -> Size | None:
+    """Return the size of a JPEG image from its frame header.
+
+    The width and the height are swapped if the image's EXIF
+    orientation rotates it by a quarter turn, as the browsers do.
+    """
+    swapped = False
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in standalone:
+            continue
+        length = struct.unpack(">H", f.read(2))[0]
+        if marker == 0xE1:
+            swapped = swapped or rotated(f.read(length - 2))
+            continue
+        if marker in frames:
+            height, width = struct.unpack(">xHH", f.read(5))
+            return (height, width) if swapped else (width, height)
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def rotated(segment: bytes) -> bool:
+    """Return whether an EXIF segment orients the image sideways."""
+    if not segment.startswith(b"Exif\0\0") or len(segment) < 14:
+        return False
+    tiff = segment[6:]
+    order = "<" if tiff[:2] == b"II" else ">"
+    try:
+        offset = struct.unpack(f"{order}I", tiff[4:8])[0]
+        (count,) = struct.unpack(f"{order}H", tiff[offset : offset + 2])
+        for index in range(count):
+            start = offset + 2 + 12 * index
+            tag, _, _, value = struct.unpack(
+                f"{order}HHIH", tiff[start : start + 10]
+            )
+            if tag == 0x0112:
+                return value in {5, 6, 7, 8}
+    except struct.error:
+        return False
+    return False
+
+
+def svg(head: bytes) -> Size | None:
+    """Return the size of an SVG image from its root element."""
+    match = SVG_RE.search(head)
+    if not match:
+        return None
+    attributes = {
+        key.decode().lower(): value.decode()
+        for key, value in re.findall(
+            rb"""([\w:-]+)\s*=\s*["']([^"']*)["']""", match.group()
+        )
+    }
+    width = LENGTH_RE.match(attributes.get("width", ""))
+    height = LENGTH_RE.match(attributes.get("height", ""))
+    if width and height:
+        return round(float(width.group(1))), round(float(height.group(1)))
+    box = attributes.get("viewbox", "").replace(",", " ").split()
+    if len(box) == 4:
+        try:
+            return round(float(box[2])), round(float(box[3]))
+        except ValueError:
+            return None
+    return None
+
+
+def measure(path: str) -> Size | None:
+    """Read the size of an image from its header.
+
+    :param path: Path of the image.
+    :return: The width and the height in pixels, or `None` if the image
+        is of an unknown format.
+    """
+    with open(path, "rb") as f:
+        head = f.read(32)
+        if head.startswith(b"\x89PNG\r\n\x1a\n"):
+            return struct.unpack(">II", head[16:24])
+        if head[:6] in {b"GIF87a", b"GIF89a"}:
+            return struct.unpack("<HH", head[6:10])
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            chunk = head[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", head[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                bits = struct.unpack("<I", head[21:25])[0]
+                return 1 + (bits & 0x3FFF), 1 + ((bits >> 14) & 0x3FFF)
+            if chunk == b"VP8X":
+                width = int.from_bytes(head[24:27], "little") + 1
+                height = int.from_bytes(head[27:30], "little") + 1
+                return width, height
+            return None
+        if head.startswith(b"\xff\xd8"):
+            return jpeg(f)
+        f.seek(0)
+        return svg(f.read(4096))
+
+
+def dimensions(path: str) -> Size | None:
+    """Return the size of an image, reading it only once per version.
+
+    :param path: Path of the image.
+    :return: The width and the height in pixels, if known.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    if key not in sizes:
+        try:
+            sizes[key] = measure(path)
+        except (OSError, struct.error, ValueError):
+            sizes[key] = None
+    return sizes[key]
+
+
+def resolve(src: str, html: str) -> str | None:
+    """Return the path of an image referenced by a page, if it's part
+    of the output.
+
+    :param src: The image's `src` attribute.
+    :param html: Path of the page referencing it.
+    """
+    parsed = urllib.parse.urlsplit(src)
+    if parsed.scheme or parsed.netloc or not parsed.path:
+        return None
+    path = urllib.parse.unquote(parsed.path)
+    return p.normpath(p.join(p.dirname(html), path))
+
+
+def annotate(tree: bs4.BeautifulSoup, html: str) -> None:
+    """Add the dimensions and the loading hints to a page's images.
+
+    The images which already have a `width` or a `height`, e.g., set
+    using the `image` directive's options, keep them, and the ones with
+    a `loading` attribute keep their hints. The images above the fold
+    are loaded eagerly, the others lazily.
+
+    :param tree: Parsed HTML tree of the page.
+    :param html: Path of the page.
+    """
+    for img in tree("img", src=True):
+        if "width" in img.attrs or "height" in img.attrs:
+            continue
+        path = resolve(img["src"], html)
+        size = dimensions(path) if path else None
+        if size and all(size):
+            img["width"], img["height"] = map(str, size)
+    content = tree.find(id="content")
+    if content is None:
+        return
+    text = 0
+    prioritised = False
+    for element in content.descendants:
+        if isinstance(element, str):
+            if element.parent.name not in {"script", "style"}:
+                text += len(element.strip())
+            continue
+        if element.name != "img" or "loading" in element.attrs:
+            continue
+        if text < fold:
+            size = pixels(element)
+            if not prioritised and (not all(size) or min(size) > small):
+                element["fetchpriority"] = "high"
+                prioritised = True
+                continue
+        else:
+            element["loading"] = "lazy"
+        element["decoding"] = "async"
+
+
+def pixels(img: bs4.Tag) -> Size:
+    """Return the width and the height of an image in pixels, or zero
+    for the ones which aren't given in pixels.
+    """
+    width, height = img.get("width", ""), img.get("height", "")
+    return (
+        int(width) if width.isdigit() else 0,
+        int(height) if height.isdigit() else 0,
+    )
@@ -0,0 +1,236 @@
+"""\
+Asset Inlining
+==============
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module inlines the small images of the output as data URIs, so
+that they don't cost a request of their own.
+
+Once the Sphinx build has finished, the local images smaller than the
+threshold are collected from two places::
+
+    [1] The `url()` references of the stylesheets in `_static`. These
+        are always inlined, as the stylesheet is cached and shared by
+        every page, hence the image is only downloaded once either way.
+    [2] The `src` of the `img` elements of the pages, e.g., the ones
+        produced by the `image` and `picture` directives. These are
+        only inlined if the copies embedded in every page referencing
+        the image weigh less than the image and the overhead of its
+        request, so an image shown on many pages stays a separate (and
+        cached) file.
+
+The images are inlined after they're optimised (see `optimise`), and
+the number of distinct images inlined is reported once they're written.
+The files themselves are left in the output, so the older pages cached
+by the browsers or the service worker can still reference them.
+
+This is an opt-in feature and can be enabled by setting
+`inline_assets_threshold` in the `html_context` to the size (in bytes)
+of the largest image to inline.
+"""
+
+from __future__ import annotations
+
+import base64
+import collections
+import os
+import os.path as p
+import re
+import typing as t
+import urllib.parse
+from pathlib import Path
+
+from sphinx.util import logging
+
+if t.TYPE_CHECKING:
+    from sphinx.application import Sphinx
+
+logger = logging.getLogger(__name__)
+
+# NOTE: Roughly the size of the headers of a request and its response,
+# which an inlined image saves besides the round trip.
+overhead: t.Final[int] = 600
+types: t.Final[dict[str, str]] = {
+    ".gif": "image/gif",
+    ".ico": "image/x-icon",
+    ".jpeg": "image/jpeg",
+    ".jpg": "image/jpeg",
+    ".png": "image/png",
+    ".svg": "image/svg+xml",
+    ".webp": "image/webp",
+}
+
+# NOTE: The data URIs are always written in double quotes, hence the
+# single quotes and the spaces of an SVG don't need to be escaped.
+safe: t.Final[str] = " /:=;,'()"
+
+CSS_URL_RE: re.Pattern[str] = re.compile(
+    r"""url\(\s*(["']?)([^"')\s]+)\1\s*\)"""
+)
+IMG_RE: re.Pattern[str] = re.compile(r"(?i)<img\b[^>]*>")
+SRC_RE: re.Pattern[str] = re.compile(
+    r"""(\ssrc=)(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))"""
+)
+
+
+def local(url: str, base: str, outdir: str) -> str | None:
+    """Return the path of an image referenced relative to a file of the
+    output, or `None` if it isn't a local image.
+
+    :param url: The reference, e.g., `../_images/logo.png`.
+    :param base: Path of the file referencing it.
+    :param outdir: The output directory of the current build.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme or parsed.netloc or parsed.query or not parsed.path:
+        return None
+    if p.splitext(parsed.path)[1].lower() not in types:
+        return None
+    path = p.normpath(
+        p.join(p.dirname(base), urllib.parse.unquote(parsed.path))
+    )
+    if not path.startswith(outdir + os.sep) or not p.isfile(path):
+        return None
+    return path
+
+
+def data_uri(path: str) -> str:
+    """Return the data URI of an image.
+
+    SVG images are percent-encoded, which is usually smaller than their
+    base64 encoding, the rest are base64 encoded.
+    """
+    kind = types[p.splitext(path)[1].lower()]
+    with open(path, "rb") as f:
+        data = f.read()
+    if kind == "image/svg+xml":
+        text = " ".join(data.decode("utf-8").split())
+        return f"data:{kind},{urllib.parse.quote(text, safe=safe)}"
+    return f"data:{kind};base64,{base64.b64encode(data).decode()}"
+
+
+def stylesheet(
+    text: str,
+    css: str,
+    outdir: str,
+    threshold: int,
+) -> tuple[str, set[str]]:
+    """Replace the small images of a stylesheet with their data URIs.
+
+    :param text: Contents of the stylesheet.
+    :param css: Path of the stylesheet.
+    :param outdir: The output directory of the current build.
+    :param threshold: Size of the largest image to inline, in bytes.
+    :return: The rewritten stylesheet and the paths of the images.
+    """
+    inlined: set[str] = set()
+
+    def replace(match: re.Match[str]) -> str:
+        """Replace a `url()` with the image's data URI."""
+        path = local(match.group(2), css, outdir)
+        if not path or p.getsize(path) > threshold:
+            return match.group()
+        inlined.add(path)
+        return f'url("{data_uri(path)}")'
+
+    return CSS_URL_RE.sub(replace, text), inlined
+
+
+def page(
+    text: str,
+    html: str,
+    outdir: str,
+    uris: dict[str, str],
+) -> tuple[str, set[str]]:
+    """Replace the `src` of a page's images with their data URIs.
+
+    :param text: Contents of the page.
+    :param html: Path of the page.
+    :param outdir: The output directory of the current build.
+    :param uris: Data URIs of the images to inline, keyed by path.
+    :return: The rewritten page and the paths of the images.
+    """
+    inlined: set[str] = set()
+
+    def source(match: re.Match[str]) -> str:
+        """Replace the `src` attribute with the image's data URI."""
+        path = local(next(filter(None, match.groups()[1:]), ""), html, outdir)
+        if path not in uris:
+            return match.group()
+        inlined.add(path)
+        return f'{match.group(1)}"{uris[path]}"'
+
+    def image(match: re.Match[str]) -> str:
+        """Rewrite the `src` of an `img` element."""
+        return SRC_RE.sub(source, match.group(), count=1)
+
+    return IMG_RE.sub(image, text), inlined
+
+
+def sources(text: str, html: str, outdir: str) -> set[str]:
+    """Return the paths of the local images shown by a page."""
+    found: set[str] = set()
+    for img in IMG_RE.findall(text):
+        match = SRC_RE.search(img)
+        if match:
+            url = next(filter(None, match.groups()[1:]), "")
+            path = local(url, html, outdir)
+            if path:
+                found.add(path)
+    return found
+
+
+def build_finished(app: Sphinx, exc: Exception | None) -> None:
+    """Inline the small images of the output directory.
+
+    :param app: The Sphinx application instance.
+    :param exc: An exception raised during the build process, or `None`
+        if the build was successful.
+    """
+    threshold = app.config.html_context.get("inline_assets_threshold")
+    if exc or app.builder.name not in {"html", "dirhtml"} or not threshold:
+        return
+    threshold = int(threshold)
+    outdir = p.abspath(app.outdir)
+    images: dict[str, set[str]] = {"stylesheets": set(), "pages": set()}
+    added = 0
+    for css in sorted(Path(outdir, "_static").rglob("*.css")):
+        text = css.read_text(encoding="utf-8")
+        rewritten, inlined = stylesheet(text, str(css), outdir, threshold)
+        if inlined:
+            css.write_text(rewritten, encoding="utf-8")
+            images["stylesheets"] |= inlined
+            added += len(rewritten.encode()) - len(text.encode())
+    texts = {
+        str(html): html.read_text(encoding="utf-8")
+        for html in sorted(Path(outdir).rglob("*.html"))
+    }
+    uses: collections.Counter[str] = collections.Counter()
+    for html, text in texts.items():
+        uses.update(
+            path
+            for path in sources(text, html, outdir)
+            if p.getsize(path) <= threshold
+        )
+    uris = {
+        path: uri
+        for path, count in uses.items()
+        if len(uri := data_uri(path)) * count <= p.getsize(path) + overhead
+    }
+    for html, text in texts.items() if uris else ():
+        rewritten, inlined = page(text, html, outdir, uris)
+        if inlined:
+            Path(html).write_text(rewritten, encoding="utf-8")
+            images["pages"] |= inlined
+            added += len(rewritten.encode()) - len(text.encode())
+    logger.info(
+        "Inlined assets: %d images (%d in stylesheets, %d in pages), "
+        "%.1f KiB added",
+        len(images["stylesheets"] | images["pages"]),
+        len(images["stylesheets"]),
+        len(images["pages"]),
+        added / 1024,
+    )
@@ -0,0 +1,279 @@
+"""\
+Image Optimisation
+==================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module losslessly recompresses the images copied to the output,
+i.e., the ones in `_static` (favicons, etc.) and in `_images`, which
+the `image`, `figure`, and `picture` directives fill.
+
+Once the Sphinx build has finished, every image is optimised based on
+its format::
+
+    [1] PNG images are re-encoded with the best compression, without
+        their text chunks, and without their ICC profile if it only
+        describes sRGB. The new image is only used if its pixels are
+        identical to the original's.
+    [2] JPEG images are never re-encoded. Their comments and metadata
+        segments, i.e., EXIF, XMP, and Photoshop's, are dropped, unless
+        the EXIF orientation rotates the image.
+    [3] SVG images are stripped of the XML declaration, comments,
+        editor metadata, and the whitespace between their elements.
+        The minified image is only used if it's still well-formed.
+
+The images are optimised in a process pool and the results are cached
+in the doctree directory by the digest of the original file, so each
+image is only optimised once across builds. A file is only replaced if
+it became smaller, and the bytes saved are reported once the images
+are written.
+
+This is an opt-in feature and can be enabled by setting
+`optimise_images` in the `html_context`.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import io
+import re
+import struct
+import typing as t
+import xml.parsers.expat
+from pathlib import Path
+
+from PIL import Image
+from PIL import ImageCms
+from sphinx.util import logging
+
+if t.TYPE_CHECKING:
+    from sphinx.application import Sphinx
+
+logger = logging.getLogger(__name__)
+
+directories: t.Final[tuple[str, ...]] = ("_static", "_images")
+suffixes: t.Final[frozenset[str]] = frozenset({".jpeg", ".jpg", ".png", ".svg"})
+
+# NOTE: APP1 carries both the EXIF and the XMP metadata, APP13 carries
+# Photoshop's, and COM the comments. APP0 (JFIF), APP2 (ICC), and
+# APP14 (Adobe's colour transform) change how the image is decoded and
+# are always kept.
+metadata: t.Final[frozenset[int]] = frozenset({0xE1, 0xED, 0xFE})
+
+SVG_COMMENT_RE: re.Pattern[bytes] = re.compile(rb"(?s)<!--.*?-->")
+SVG_DECLARATION_RE: re.Pattern[bytes] = re.compile(rb"^\s*<\?xml[^>]*\?>")
+SVG_EDITOR_RE: re.Pattern[bytes] = re.compile(
+    rb"(?s)<(metadata|(?:inkscape|sodipodi):[\w.-]+)\b[^>]*?(?:/>|>.*?</\1\s*>)"
+)
+SVG_NAMESPACE_RE: re.Pattern[bytes] = re.compile(
+    rb"""\s(?:xmlns:)?(?:inkscape|sodipodi)(?::[\w-]+)?\s*=\s*(?:"[^"]*"|'[^']*')"""
+)
+SVG_WHITESPACE_RE: re.Pattern[bytes] = re.compile(rb">\s+<")
+
+
+def png(data: bytes) -> bytes:
+    """Recompress a PNG image, keeping its pixels as they are.
+
+    Animated images are returned unchanged, as Pillow only writes their
+    first frame by default.
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        if getattr(image, "is_animated", False):
+            return data
+        image.load()
+        options: dict[str, t.Any] = {"optimize": True}
+        if "transparency" in image.info:
+            options["transparency"] = image.info["transparency"]
+        # NOTE: Pillow writes the profile of the original image unless
+        # it's overridden.
+        profile = image.info.get("icc_profile")
+        options["icc_profile"] = None if srgb(profile or b"") else profile
+        output = io.BytesIO()
+        image.save(output, "PNG", **options)
+        mode, pixels = image.mode, image.tobytes()
+    with Image.open(io.BytesIO(output.getvalue())) as optimised:
+        if optimised.mode != mode or optimised.tobytes() != pixels:
+            return data
+    return output.getvalue()
+
+
+def srgb(profile: bytes) -> bool:
+    """Return whether an ICC profile describes sRGB, which the browsers
+    assume for the untagged images anyway.
+    """
+    try:
+        parsed = ImageCms.ImageCmsProfile(io.BytesIO(profile))
+        return "sRGB" in ImageCms.getProfileDescription(parsed)
+    except (ImageCms.PyCMSError, OSError):
+        return False
+
+
+def oriented(segment: bytes) -> bool:
+    """Return whether an EXIF segment sets an orientation other than
+    the default one, in which case it can't be dropped.
+    """
+    if not segment.startswith(b"Exif\0\0"):
+        return False
+    tiff = segment[6:]
+    order = "<" if tiff[:2] == b"II" else ">"
+    try:
+        offset = struct.unpack(f"{order}I", tiff[4:8])[0]
+        (count,) = struct.unpack(f"{order}H", tiff[offset : offset + 2])
+        for index in range(count):
+            start = offset + 2 + 12 * index
+            tag, _, _, value = struct.unpack(
+                f"{order}HHIH", tiff[start : start + 10]
+            )
+            if tag == 0x0112:
+                return value != 1
+    except struct.error:
+        return True
+    return False
+
+
+def jpeg(data: bytes) -> bytes:
+    """Drop the metadata segments of a JPEG image.
+
+    The segments are copied up to the start of the scan, after which
+    the entropy-coded data is copied as is.
+    """
+    if not data.startswith(b"\xff\xd8"):
+        return data
+    kept = [data[:2]]
+    index = 2
+    while index + 4 <= len(data):
+        if data[index] != 0xFF:
+            return data
+        marker = data[index + 1]
+        if marker == 0xDA:
+            kept.append(data[index:])
+            return b"".join(kept)
+        length = struct.unpack(">H", data[index + 2 : index + 4])[0]
+        segment = data[index : index + 2 + length]
+        if marker not in metadata or (marker == 0xE1 and oriented(segment[4:])):
+            kept.append(segment)
+        index += 2 + length
+    return data
+
+
+def svg(data: bytes) -> bytes:
+    """Minify an SVG image.
+
+    The whitespace between the elements is kept in the images with
+    text, where it may be rendered.
+    """
+    data = SVG_DECLARATION_RE.sub(b"", data)
+    data = SVG_COMMENT_RE.sub(b"", data)
+    data = SVG_EDITOR_RE.sub(b"", data)
+    data = SVG_NAMESPACE_RE.sub(b"", data)
+    if b"<text" not in data:
+        data = SVG_WHITESPACE_RE.sub(b"><", data)
+    return data.strip()
+
+
+def wellformed(data: bytes) -> bool:
+    """Return whether an SVG image still parses as namespaced XML, e.g.,
+    that no element uses a prefix whose declaration was stripped.
+    """
+    parser = xml.parsers.expat.ParserCreate(namespace_separator=" ")
+    try:
+        parser.Parse(data, True)
+    except xml.parsers.expat.ExpatError:
+        return False
+    return True
+
+
+def recompress(data: bytes, suffix: str) -> bytes:
+    """Optimise an image based on its format.
+
+    This runs in the worker processes, hence it only deals with bytes.
+
+    :param data: Contents of the image.
+    :param suffix: Lowercase extension of the image, e.g., `.png`.
+    :return: The optimised contents, which are never larger than the
+        original's.
+    """
+    try:
+        if suffix == ".png":
+            optimised = png(data)
+        elif suffix == ".svg":
+            optimised = svg(data)
+            if not wellformed(optimised):
+                return data
+        else:
+            optimised = jpeg(data)
+    except (OSError, SyntaxError, ValueError, struct.error):
+        return data
+    return optimised if len(optimised) < len(data) else data
+
+
+def images(outdir: Path) -> list[Path]:
+    """Return the images of the output which can be optimised."""
+    found: list[Path] = []
+    for directory in directories:
+        found.extend(
+            path
+            for path in sorted((outdir / directory).rglob("*"))
+            if path.is_file() and path.suffix.lower() in suffixes
+        )
+    return found
+
+
+def build_finished(app: Sphinx, exc: Exception | None) -> None:
+    """Optimise the images of the output directory in place.
+
+    :param app: The Sphinx application instance.
+    :param exc: An exception raised during the build process, or `None`
+        if the build was successful.
+    """
+    if (
+        exc
+        or app.builder.name not in {"html", "dirhtml"}
+        or not app.config.html_context.get("optimise_images")
+    ):
+        return
+    cache = Path(app.doctreedir, "images")
+    pending: dict[Path, tuple[bytes, Path]] = {}
+    before = after = optimised = 0
+    paths = images(Path(app.outdir))
+    for path in paths:
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        cached = cache / f"{digest}{path.suffix.lower()}"
+        before += len(data)
+        result = cached.read_bytes() if cached.is_file() else b""
+        # NOTE: The SVG images minified by the older versions may have
+        # been cached with a namespace prefix left unbound.
+        if not result or (cached.suffix == ".svg" and not wellformed(result)):
+            pending[path] = (data, cached)
+            continue
+        if len(result) < len(data):
+            path.write_bytes(result)
+            optimised += 1
+        after += len(result)
+    if pending:
+        cache.mkdir(parents=True, exist_ok=True)
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            results = executor.map(
+                recompress,
+                [data for data, _ in pending.values()],
+                [path.suffix.lower() for path in pending],
+            )
+            for (path, (data, cached)), result in zip(
+                pending.items(), results, strict=True
+            ):
+                cached.write_bytes(result)
+                if len(result) < len(data):
+                    path.write_bytes(result)
+                    optimised += 1
+                after += len(result)
+    logger.info(
+        "Images: optimised %d of %d files (%d new), saved %.1f KiB",
+        optimised,
+        len(paths),
+        len(pending),
+        (before - after) / 1024,
+    )
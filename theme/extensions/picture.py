@@ -4,7 +4,7 @@ Picture Directive
 
 Author: Akshay Mestry <xa@mes3.dev>
 Created on: 02 September, 2025
-Last updated on: 02 November, 2025
+Last updated on: 19 October, 2026
 
 This module defines a custom `picture` directive for this sphinx theme.
 The directive allows embedding and rendering images specific to the
@@ -31,6 +31,12 @@ theme's Jinja2 template, producing a final HTML output.
 
     Simplified the directive to render images according to the theme's
     colour scheme using the `img` tag instead of fancy Javascript.
+
+.. versionchanged:: 19.10.2026
+
+    The directive now renders a native `picture` element with a
+    `prefers-color-scheme` source and a real fallback `src`, so the
+    browsers can start fetching the image before any script runs.
 """
 
 from __future__ import annotations
@@ -44,10 +50,15 @@ import docutils.nodes as nodes
 import jinja2
 from docutils.parsers import rst
 from docutils.parsers.rst.directives import images
+from sphinx.util import logging
+
+from theme.extensions import cache
 
 if t.TYPE_CHECKING:
     from sphinx.writers.html import HTMLTranslator
 
+logger = logging.getLogger(__name__)
+
 name: t.Final[str] = "picture"
 here: str = p.dirname(__file__)
 templates: str = "../base/templates"
@@ -90,6 +101,11 @@ class directive(images.Figure):
         Simplified the directive to render images according to the
         theme's colour scheme using the `img` tag instead of fancy
         Javascript.
+
+    .. versionchanged:: 19.10.2026
+
+        Render a native `picture` element instead of binding the `src`
+        of the `img` tag using Alpine.js.
     """
 
     required_arguments = 0
@@ -113,12 +129,16 @@ class directive(images.Figure):
         'light' and 'dark' suffixes to create the final image paths.
 
         :return: A list containing a single `node` element.
+
+        .. versionchanged:: 19.10.2026
+
+            The images are noted as dependencies of the document and
+            copied to the output while writing it, so that the output
+            has them even if the document isn't read again.
         """
         env = self.state.document.settings.env
         depth = env.docname.count("/")
         doc_dir = p.dirname(env.doc2path(env.docname))
-        images_dir = p.join(env.app.builder.outdir, "_images")
-        os.makedirs(images_dir, exist_ok=True)
         allowed = (
             "left",
             "center",
@@ -128,27 +148,12 @@ class directive(images.Figure):
             "bottom",
             "default",
         )
-
-        def _copy(src: str) -> None:
-            """Copy the source image to the destination if it doesn't
-            already exist or is outdated.
-            """
-            dest = p.join(images_dir, p.basename(src))
-            try:
-                if (
-                    not p.exists(dest)
-                    or os.stat(src).st_mtime > os.stat(dest).st_mtime
-                ):
-                    shutil.copy2(src, dest)
-            except OSError as exc:
-                raise self.error(
-                    f"Failed to copy {src!r} to {dest!r}: {exc}"
-                ) from exc
-
         light = p.normpath(p.join(doc_dir, self.options["light"]))
         dark = p.normpath(p.join(doc_dir, self.options["dark"]))
         for mode in [light, dark]:
-            _copy(mode)
+            if not p.isfile(mode):
+                raise self.error(f"Image not found: {mode!r}")
+            env.note_dependency(mode)
         prefix = "../" * depth if depth else ""
         klass = self.options.get("class", "")
         align = self.options.get("align", "default")
@@ -162,11 +167,24 @@ class directive(images.Figure):
             "align": align,
             "figclass": self.options.get("figclass", klass),
             "caption": "\n".join(self.content) if self.content else "",
+            "sources": [p.relpath(mode, env.srcdir) for mode in [light, dark]],
         }
         element = node("", **attributes)
         return [element]
 
 
+def copy(src: str, images: str) -> None:
+    """Copy an image to the output, unless it's already up to date.
+
+    :param src: Path of the source image.
+    :param images: The output's images directory.
+    """
+    dest = p.join(images, p.basename(src))
+    if not p.exists(dest) or os.stat(src).st_mtime > os.stat(dest).st_mtime:
+        os.makedirs(images, exist_ok=True)
+        shutil.copy2(src, dest)
+
+
 def visit(self: HTMLTranslator, node: node) -> None:
     """Handle the entry processing of the `picture` node during HTML
     generation.
@@ -179,8 +197,29 @@ def visit(self: HTMLTranslator, node: node) -> None:
     :param self: The HTML translator instance responsible for rendering
         nodes into HTML.
     :param node: The `picture` node containing parsed attributes.
+
+    .. versionchanged:: 19.10.2026
+
+        The images are copied to the output here, instead of when the
+        document is read.
     """
-    self.body.append(template.render(**node.attributes))
+    images = p.join(self.builder.outdir, "_images")
+    sources: list[str] = node.get("sources", [])
+    for source in sources:
+        src = p.join(self.builder.srcdir, source)
+        try:
+            copy(src, images)
+        except OSError as exc:
+            logger.warning(
+                "Failed to copy %r to %r: %s",
+                src,
+                images,
+                exc,
+                location=node,
+                type="theme",
+                subtype="picture",
+            )
+    self.body.append(cache.render(name, template, **node.attributes))
 
 
 def depart(self: HTMLTranslator, node: node) -> None:
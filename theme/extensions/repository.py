@@ -4,7 +4,7 @@ GitHub Repository Directive
 
 Author: Akshay Mestry <xa@mes3.dev>
 Created on: 29 October, 2025
-Last updated on: 02 November, 2025
+Last updated on: 19 October, 2026
 
 This module defines a custom `repository` directive for this sphinx
 theme. The directive allows embedding GitHub repository details on the
@@ -23,6 +23,14 @@ follows::
 
 The above snippet will be processed and rendered according to the
 theme's Jinja2 template, producing a final HTML output.
+
+.. versionchanged:: 19.10.2026
+
+    [1] The `repository` node now carries the repository's name and
+        is rendered when the page is written, rather than being stored
+        in the doctree as raw HTML.
+    [2] The pages with a repository card preconnect to the GitHub API,
+        which the card's script fetches the counts from.
 """
 
 from __future__ import annotations
@@ -34,9 +42,13 @@ import docutils.nodes as nodes
 import jinja2
 from docutils.parsers import rst
 
+from theme.extensions import cache
+
 if t.TYPE_CHECKING:
     from sphinx.writers.html import HTMLTranslator
 
+    from theme.extensions.hints import Origin
+
 name: t.Final[str] = "repository"
 here: str = p.dirname(__file__)
 templates: str = "../base/templates"
@@ -92,10 +104,13 @@ class directive(rst.Directive):
         """
         self.assert_has_content()
         self.options["repo"] = "".join(self.content)
-        attributes: dict[str, str] = {}
-        attributes["text"] = template.render(**self.options)
-        attributes["format"] = "html"
-        return [nodes.raw(**attributes)]
+        element = node("", **self.options)
+        return [element]
+
+
+def origins(_: node) -> list[Origin]:
+    """Return the origin of the GitHub API, fetched in CORS mode."""
+    return [("https://api.github.com", True)]
 
 
 def visit(self: HTMLTranslator, node: node) -> None:
@@ -104,13 +119,14 @@ def visit(self: HTMLTranslator, node: node) -> None:
 
     This method is called when the HTML translator encounters the
     `repository` node in the document tree. It retrieves the relevant
-    attributes from the node (if any) and uses Jinja2 templating to
-    produce the final HTML output. Since the `repository` node does not
-    require any actions, the method currently acts as a placeholder.
+    attributes from the node and uses Jinja2 templating to produce the
+    final HTML output.
 
-    :param self: The HTML translator instance.
-    :param node: The `repository` node being processed.
+    :param self: The HTML translator instance responsible for rendering
+        nodes into HTML.
+    :param node: The `repository` node containing parsed attributes.
     """
+    self.body.append(cache.render(name, template, **node.attributes))
 
 
 def depart(self: HTMLTranslator, node: node) -> None:
@@ -4,7 +4,7 @@ Custom Roles
 
 Author: Akshay Mestry <xa@mes3.dev>
 Created on: 21 February, 2025
-Last updated on: 29 December, 2025
+Last updated on: 19 October, 2026
 
 This module provides custom roles for this sphinx theme that provides a
 way to add features to the document.
@@ -115,21 +115,27 @@ def email(
         generated during processing (typically empty if no errors).
     :raises: None, but will report an error message if the input format
         is invalid.
+
+    .. versionchanged:: 19.10.2026
+
+        The default subject is filled in by the theme's post-transform
+        which looks up the page's title once per document, instead of
+        walking the whole document for every link.
     """
-    # NOTE(xames3): The parameters `role`, `options`, and `content` are
-    # currently unused but are included to match the expected signature
-    # for a Sphinx role function.
+    # NOTE(xames3): The parameters `role`, `inliner`, `options`, and
+    # `content` are currently unused but are included to match the
+    # expected signature for a Sphinx role function.
     role = role or ""
+    inliner = inliner or None
     options = options or {}
     content = content or []
-    titles = inliner.document.traverse(nodes.title)
-    subject = titles[0].children[-1].astext().strip()
     alt, rest = text.split("<", 1)
-    alt = alt.strip()
-    if "|" in rest:
-        href, *subject = rest.split("|", 1)
-        subject = subject[0].strip(">")
-    else:
-        href = rest.strip(">")
-    refuri = f"mailto:{href.strip()}?subject={subject}"
-    return [nodes.reference(rawtext, alt, refuri=refuri, line=lineno)], []
+    href, _, subject = rest.strip().strip(">").partition("|")
+    href = href.strip()
+    refuri = f"mailto:{href}"
+    node = nodes.reference(rawtext, alt.strip(), refuri=refuri, line=lineno)
+    node["email"] = href
+    if subject:
+        node["subject"] = subject.strip()
+        node["refuri"] += f"?subject={node['subject']}"
+    return [node], []
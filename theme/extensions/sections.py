@@ -0,0 +1,129 @@
+"""\
+Deferred Sections
+=================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module lets the browser skip the rendering of the sections of a
+long article until the reader scrolls near them.
+
+While post-processing a page whose article is long enough, each of its
+top-level sections (the ones starting with an `h2`), except the first,
+is given the `site-section--deferred` class, which sets
+`content-visibility: auto`, and an estimate of its rendered height in
+the `--section-height` property, which the stylesheet uses as its
+`contain-intrinsic-size` until the browser has rendered it once. The
+sections are also marked with `data-deferred`, so that `theme.js` only
+sets up their components once they approach the viewport.
+
+The height of a section is estimated from its content, i.e., the lines
+of text at the article's width, the lines of code, the dimensions of
+the images, and so on. Since the browser remembers the actual size of
+a section once rendered, the estimate only needs to be close enough to
+keep the scrollbar from jumping.
+
+This is an opt-in feature and can be enabled by setting
+`content_visibility` in the `html_context`.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+import bs4
+
+# NOTE: The article is never deferred unless it's at least as long as a
+# few screens, since the containment then costs more than it saves.
+length: t.Final[int] = 8000
+width: t.Final[int] = 861
+characters: t.Final[int] = 95
+line: t.Final[int] = 24
+code: t.Final[int] = 20
+gap: t.Final[int] = 16
+embed: t.Final[int] = round(width * 9 / 16)
+
+heights: t.Final[dict[str, int]] = {
+    "h2": 140,
+    "h3": 64,
+    "h4": 56,
+    "h5": 48,
+    "h6": 48,
+}
+padding: t.Final[dict[str, int]] = {
+    "figure": 128,
+    "pre": 32,
+    "table": 32,
+}
+admonition: t.Final[int] = 48
+text: t.Final[frozenset[str]] = frozenset(
+    {"caption", "dd", "dt", "figcaption", "li", "p", "td", "th"}
+)
+
+
+def lines(element: bs4.Tag) -> int:
+    """Return the height of a block of text at the article's width."""
+    count = len(" ".join(element.get_text().split()))
+    return max(1, -(-count // characters)) * line + gap
+
+
+def image(element: bs4.Tag) -> int:
+    """Return the height of an image scaled to the article's width."""
+    try:
+        w, h = int(element.get("width", 0)), int(element.get("height", 0))
+    except ValueError:
+        return embed
+    if not w or not h:
+        return embed
+    return round(h * min(1, width / w))
+
+
+def estimate(element: bs4.Tag) -> int:
+    """Estimate the rendered height of an element of the article.
+
+    :param element: An element of the article.
+    :return: The estimated height in pixels.
+    """
+    name = element.name
+    if name in heights:
+        return heights[name]
+    if name == "pre":
+        return len(element.get_text().splitlines()) * code + padding[name]
+    if name == "img":
+        return image(element)
+    if name in {"iframe", "video"}:
+        return embed
+    if name == "tr":
+        return max(
+            (estimate(cell) for cell in element.find_all(["td", "th"])),
+            default=line,
+        )
+    children = element.find_all(recursive=False)
+    if name in text and not any(_.name in {"p", "pre"} for _ in children):
+        return lines(element)
+    if not children:
+        return lines(element) if element.get_text(strip=True) else 0
+    total = sum(estimate(child) for child in children)
+    if "admonition" in element.get("class", ()):
+        return total + admonition
+    return total + padding.get(name, 0)
+
+
+def defer(tree: bs4.BeautifulSoup) -> None:
+    """Mark the sections of a long article to be rendered on demand.
+
+    :param tree: Parsed HTML tree of the page.
+    """
+    content = tree.find(id="content")
+    if not isinstance(content, bs4.Tag):
+        return
+    article = content.find("section", recursive=False)
+    if not isinstance(article, bs4.Tag) or len(article.get_text()) < length:
+        return
+    for section in article.find_all("section", recursive=False)[1:]:
+        section["class"] = [*section.get("class", []), "site-section--deferred"]
+        style = section.get("style", "").rstrip("; ")
+        height = f"--section-height: {estimate(section)}px"
+        section["style"] = f"{style}; {height}" if style else height
+        section["data-deferred"] = ""
@@ -0,0 +1,138 @@
+"""\
+Service Worker
+==============
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module generates a build-versioned service worker for the website
+once the Sphinx build has finished.
+
+The worker precaches the theme's static assets (stylesheets, scripts,
+fonts, icons, etc.), keeps a small cache of recently visited pages, and
+serves them back according to the following strategies::
+
+    [1] Pages are served stale-while-revalidate, i.e., the cached copy
+        is returned immediately while a fresh one is fetched in the
+        background for the next visit.
+    [2] Fingerprinted (versioned) and precached assets are served
+        cache-first.
+    [3] Everything else on the same origin is served
+        stale-while-revalidate from a runtime cache.
+
+The fingerprinted assets which aren't precached are kept in the runtime
+cache too, which is versioned like the precache and trimmed to its
+most recently added entries.
+
+The worker is opt-in and can be enabled by setting `service_worker` in
+the `html_context` of the `conf.py`. The number of pages kept offline
+can be tuned using `service_worker_max_pages`, and the number of other
+responses kept using `service_worker_max_runtime`.
+
+.. note::
+
+    The precache manifest is inlined in the generated worker and its
+    version is derived from the content of the precached files. Hence,
+    any change in the assets produces a byte-different worker, which
+    makes the browsers install it and drop the stale caches.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os.path as p
+import typing as t
+from pathlib import Path
+
+import jinja2
+from sphinx.util import logging
+
+if t.TYPE_CHECKING:
+    from sphinx.application import Sphinx
+
+logger = logging.getLogger(__name__)
+
+name: t.Final[str] = "sw.js"
+here: str = p.dirname(__file__)
+templates: str = "../base/templates"
+js = p.join(p.abspath(p.join(here, templates)), "serviceworker.js.jinja")
+precached_dirs: t.Sequence[str] = ("_static", "_sphinx_design_static")
+precached_suffixes: t.Sequence[str] = (
+    ".css",
+    ".ico",
+    ".js",
+    ".png",
+    ".svg",
+    ".webmanifest",
+    ".woff",
+    ".woff2",
+)
+max_precached_size: t.Final[int] = 1024 * 1024
+
+with open(js) as f:
+    template = jinja2.Template(f.read())
+
+
+def precache_manifest(outdir: Path) -> list[tuple[str, str]]:
+    """Collect the static assets the service worker should precache.
+
+    Only the files under the static directories whose suffixes are
+    listed in `precached_suffixes` and are smaller than a megabyte are
+    considered. The entries are sorted to keep the output stable across
+    builds.
+
+    :param outdir: The output directory of the current build.
+    :return: A list of tuples with URL (relative to the output
+        directory) and the content digest of each asset.
+    """
+    manifest: list[tuple[str, str]] = []
+    for directory in precached_dirs:
+        root = outdir / directory
+        if not root.is_dir():
+            continue
+        for path in sorted(root.rglob("*")):
+            if (
+                not path.is_file()
+                or path.suffix not in precached_suffixes
+                or path.stat().st_size > max_precached_size
+            ):
+                continue
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            manifest.append((path.relative_to(outdir).as_posix(), digest))
+    return manifest
+
+
+def build_finished(app: Sphinx, exc: Exception | None) -> None:
+    """Write the service worker to the root of the output directory.
+
+    The worker is written at the root so that its scope covers every
+    page of the website. It is generated only for successful `html` or
+    `dirhtml` builds with `service_worker` enabled in `html_context`.
+
+    :param app: The Sphinx application instance.
+    :param exc: An exception raised during the build process, or `None`
+        if the build was successful.
+    """
+    ctx = app.config.html_context
+    if (
+        exc
+        or app.builder.name not in {"html", "dirhtml"}
+        or not ctx.get("service_worker")
+    ):
+        return
+    outdir = Path(app.outdir)
+    manifest = precache_manifest(outdir)
+    version = hashlib.sha256(repr(manifest).encode()).hexdigest()[:12]
+    start = app.builder.get_target_uri(app.config.root_doc) or "./"
+    text = template.render(
+        version=version,
+        precache=[url for url, _ in manifest],
+        start_url=start,
+        max_pages=int(ctx.get("service_worker_max_pages", 50)),
+        max_runtime=int(ctx.get("service_worker_max_runtime", 100)),
+    )
+    (outdir / name).write_text(text, encoding="utf-8")
+    logger.info(
+        "Service worker %s: precached %d assets", version, len(manifest)
+    )
@@ -0,0 +1,132 @@
+"""\
+Source Hashes
+=============
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module skips reading the documents whose contents haven't changed,
+even though their modification times have.
+
+Sphinx decides which documents to read again by comparing modification
+times, which a fresh checkout (or switching branches) resets for every
+file. Hence, a restored doctree cache in CI still results in reading
+every document again.
+
+The theme keeps an index of the content hashes of every document read,
+computed over its source and its dependencies, i.e., the included
+files and the images referenced by the directives. The index is stored
+in (and pickled along with) the build environment. Before reading, the
+documents whose hash is the same as in the index are dropped from the
+list of documents to read.
+
+.. note::
+
+    Nothing is skipped if the configuration, the extensions, or the
+    environment's version changed, as Sphinx reads every document again
+    for a reason other than their contents in those cases.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os.path as p
+import time
+import typing as t
+
+from sphinx.environment import CONFIG_OK
+from sphinx.util import logging
+
+if t.TYPE_CHECKING:
+    from sphinx.application import Sphinx
+    from sphinx.environment import BuildEnvironment
+
+logger = logging.getLogger(__name__)
+
+reading: list[str] = []
+skipped: list[str] = []
+
+
+def digest(env: BuildEnvironment, docname: str) -> str:
+    """Return the content hash of a document and its dependencies.
+
+    The dependencies are hashed along with their paths relative to the
+    source directory, so that the hash doesn't depend on where the
+    project is checked out. Missing files are hashed as such.
+
+    :param env: The build environment.
+    :param docname: Name of the document.
+    :return: Hexadecimal digest of the document.
+    """
+    sha = hashlib.sha256()
+    paths = [env.doc2path(docname)]
+    paths += sorted(env.dependencies.get(docname, ()), key=str)
+    for path in paths:
+        sha.update(p.relpath(path, env.srcdir).encode())
+        try:
+            with open(path, "rb") as f:
+                sha.update(hashlib.file_digest(f, "sha256").digest())
+        except OSError:
+            sha.update(b"\0missing")
+    return sha.hexdigest()
+
+
+def env_before_read_docs(
+    _: Sphinx, env: BuildEnvironment, docnames: list[str]
+) -> None:
+    """Drop the documents whose contents haven't changed from the list
+    of documents to read.
+
+    The read time of the dropped documents is updated, so that Sphinx
+    doesn't consider them outdated on the next build either.
+
+    :param _: The Sphinx application instance (unused).
+    :param env: The build environment.
+    :param docnames: Names of the documents to read, modified in place.
+    """
+    reading.clear()
+    skipped.clear()
+    hashes: dict[str, str] = getattr(env, "theme_hashes", {})
+    if env.config_status == CONFIG_OK and hashes:
+        now = time.time_ns() // 1_000
+        unchanged = [
+            docname
+            for docname in docnames
+            if docname in env.all_docs
+            and docname not in env.reread_always
+            and p.isfile(p.join(env.doctreedir, f"{docname}.doctree"))
+            and hashes.get(docname) == digest(env, docname)
+        ]
+        for docname in unchanged:
+            docnames.remove(docname)
+            env.all_docs[docname] = now
+        skipped.extend(unchanged)
+        if unchanged:
+            logger.info(
+                "Skipped reading %d unchanged documents",
+                len(unchanged),
+            )
+    reading.extend(docnames)
+
+
+def env_updated(_: Sphinx, env: BuildEnvironment) -> list[str]:
+    """Update the index with the hashes of the documents just read.
+
+    The skipped documents are reported as updated, as Sphinx only
+    pickles the environment (along with their new read times) if any
+    document was updated. Their pages are written again either way, as
+    their sources are newer than the pages.
+
+    :param _: The Sphinx application instance (unused).
+    :param env: The build environment.
+    :return: Names of the skipped documents.
+    """
+    hashes: dict[str, str] = getattr(env, "theme_hashes", {})
+    for docname in reading:
+        hashes[docname] = digest(env, docname)
+    for docname in hashes.keys() - env.all_docs.keys():
+        del hashes[docname]
+    env.theme_hashes = hashes
+    reading.clear()
+    return list(skipped)
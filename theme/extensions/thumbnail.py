@@ -4,7 +4,7 @@ YouTube Thumbnail Directive
 
 Author: Akshay Mestry <xa@mes3.dev>
 Created on: 06 September, 2025
-Last updated on: 02 November, 2025
+Last updated on: 19 October, 2026
 
 This module defines a custom `thumbnail` directive for this sphinx theme.
 The directive allows embedding a YouTube video thumbnail card directly
@@ -23,6 +23,14 @@ follows::
 
 The above snippet will be processed and rendered according to the
 theme's Jinja2 template, producing a final HTML output.
+
+.. versionchanged:: 19.10.2026
+
+    [1] The card is rendered while writing the page from the
+        `thumbnail` node, which only keeps the video's URL.
+    [2] The pages with a card load the `youtube` script module, which
+        fills the card's title and channel, and preconnect to the
+        thumbnail's domain.
 """
 
 from __future__ import annotations
@@ -34,10 +42,15 @@ import docutils.nodes as nodes
 import docutils.parsers.rst as rst
 import jinja2
 
+from theme.extensions import cache
+
 if t.TYPE_CHECKING:
     from sphinx.writers.html import HTMLTranslator
 
+    from theme.extensions.hints import Origin
+
 name: t.Final[str] = "thumbnail"
+feature: t.Final[str] = "youtube"
 here: str = p.dirname(__file__)
 templates: str = "../base/templates"
 html = p.join(p.abspath(p.join(here, templates)), "thumbnail.html.jinja")
@@ -90,21 +103,19 @@ class directive(rst.Directive):
                 manner.
         """
         self.assert_has_content()
-        src = rst.directives.uri(self.content.pop())
-        vid = src
-        if "youtu.be/" in src:
-            vid = src.rsplit("/", 1)[-1].split("?", 1)[0]
-        elif "watch?v=" in src:
-            vid = src.split("v=", 1)[-1].split("&", 1)[0]
-        self.options["src"] = src
-        self.options["video_id"] = vid
-        self.options["thumbnail"] = (
-            f"https://img.youtube.com/vi/{vid}/hqdefault.jpg"
-        )
-        attributes: dict[str, str] = {}
-        attributes["text"] = template.render(**self.options)
-        attributes["format"] = "html"
-        return [nodes.raw(**attributes)]
+        self.options["src"] = rst.directives.uri(self.content[-1])
+        element = node("", **self.options)
+        return [element]
+
+
+def origins(_: node) -> list[Origin]:
+    """Return the origins of the card's image and, later, its oEmbed
+    request.
+    """
+    return [
+        ("https://img.youtube.com", False),
+        ("https://www.youtube.com", True),
+    ]
 
 
 def visit(self: HTMLTranslator, node: node) -> None:
@@ -113,13 +124,29 @@ def visit(self: HTMLTranslator, node: node) -> None:
 
     This method is called when the HTML translator encounters the
     `thumbnail` node in the document tree. It retrieves the relevant
-    attributes from the node (if any) and uses Jinja2 templating to
-    produce the final HTML output. Since the `thumbnail` node does not
-    require any actions, the method currently acts as a placeholder.
+    attributes from the node and uses Jinja2 templating to produce the
+    final HTML output.
 
-    :param self: The HTML translator instance.
-    :param node: The `thumbnail` node being processed.
+    :param self: The HTML translator instance responsible for rendering
+        nodes into HTML.
+    :param node: The `thumbnail` node containing parsed attributes.
     """
+    src = node["src"]
+    vid = src
+    if "youtu.be/" in src:
+        vid = src.rsplit("/", 1)[-1].split("?", 1)[0]
+    elif "watch?v=" in src:
+        vid = src.split("v=", 1)[-1].split("&", 1)[0]
+    thumbnail = f"https://img.youtube.com/vi/{vid}/hqdefault.jpg"
+    self.body.append(
+        cache.render(
+            name,
+            template,
+            **node.attributes,
+            video_id=vid,
+            thumbnail=thumbnail,
+        )
+    )
 
 
 def depart(self: HTMLTranslator, node: node) -> None:
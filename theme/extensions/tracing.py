@@ -0,0 +1,213 @@
+"""\
+Build Tracing
+=============
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module provides an opt-in instrumentation layer for profiling
+where the theme spends its time during a Sphinx build.
+
+Every event handler, directive, role, transform, and node visitor
+registered by the theme is wrapped using `traced`, which measures the
+wrapped call using a monotonic clock. The wrappers are always
+installed, but they only record anything once the tracing is enabled,
+either by setting `trace_build` in the `html_theme_options` or by
+setting the `KAAMIKI_TRACE` environment variable.
+
+When the build finishes, the recorded spans are written as a Chrome
+trace-event file, viewable in `chrome://tracing` or Perfetto, along
+with a summary of the slowest calls::
+
+    [1] `<doctreedir>/trace/trace.json`, i.e., the trace-event file.
+    [2] `<doctreedir>/trace/summary.json`, i.e., the calls, total,
+        mean, and maximum duration of each traced callable.
+
+.. note::
+
+    Sphinx forks worker processes for parallel (`-j`) builds, which
+    exit without returning anything to the main process. Hence, the
+    workers spill their spans to per-process files in the trace
+    directory and the main process merges them at the end.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+from sphinx.util import logging
+
+if t.TYPE_CHECKING:
+    import types
+    from collections.abc import Callable
+
+    from sphinx.application import Sphinx
+
+logger = logging.getLogger(__name__)
+
+variable: t.Final[str] = "KAAMIKI_TRACE"
+top: t.Final[int] = 15
+
+enabled: bool = False
+main_pid: int = os.getpid()
+directory: Path | None = None
+spans: list[dict[str, t.Any]] = []
+spill: t.TextIO | None = None
+
+
+def traced[**P, R](fn: Callable[P, R], category: str) -> Callable[P, R]:
+    """Wrap a callable to record its duration while tracing is enabled.
+
+    :param fn: The callable to trace.
+    :param category: Category of the span, e.g., `directive`.
+    :return: The wrapped callable.
+    """
+    name = f"{fn.__module__.removeprefix('theme.extensions.')}."
+    name += fn.__qualname__
+
+    @functools.wraps(fn)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        """Time the wrapped callable."""
+        if not enabled:
+            return fn(*args, **kwargs)
+        start = time.monotonic_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record(name, category, start, time.monotonic_ns())
+
+    return wrapper
+
+
+def traced_run(cls: type[t.Any], category: str) -> type[t.Any]:
+    """Return a subclass of a directive or transform with its `run`
+    method traced.
+    """
+    return type(cls.__name__, (cls,), {"run": traced(cls.run, category)})
+
+
+def instrument(module: types.ModuleType, *names: str) -> None:
+    """Trace module-level functions in place.
+
+    This is used for functions which are called directly by other
+    functions of the same module, e.g., the post-processing steps.
+
+    :param module: Module defining the functions.
+    :param names: Names of the functions to trace.
+    """
+    for name in names:
+        setattr(module, name, traced(getattr(module, name), module.__name__))
+
+
+def record(name: str, category: str, start: int, end: int) -> None:
+    """Record a complete span in the Chrome trace-event format.
+
+    Spans recorded by the forked worker processes are appended to a
+    per-process file, line buffered so that nothing is lost when the
+    worker exits.
+    """
+    global spill
+    span = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start / 1000,
+        "dur": (end - start) / 1000,
+        "pid": os.getpid(),
+        "tid": threading.get_native_id(),
+    }
+    if span["pid"] == main_pid or directory is None:
+        spans.append(span)
+        return
+    if spill is None:
+        path = directory / f"{span['pid']}.jsonl"
+        spill = path.open("a", encoding="utf-8", buffering=1)
+    spill.write(json.dumps(span) + "\n")
+
+
+def builder_inited(app: Sphinx) -> None:
+    """Enable tracing if it's requested through the theme options or
+    the environment.
+
+    :param app: The Sphinx application instance.
+    """
+    global enabled, main_pid, directory
+    options = app.config.html_theme_options
+    enabled = bool(options.get("trace_build") or os.environ.get(variable))
+    if not enabled:
+        return
+    main_pid = os.getpid()
+    directory = Path(app.doctreedir, "trace")
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("*.jsonl"):
+        stale.unlink()
+    spans.clear()
+
+
+def summarise(events: list[dict[str, t.Any]]) -> list[dict[str, t.Any]]:
+    """Aggregate spans by their name.
+
+    :param events: Spans in the Chrome trace-event format.
+    :return: Calls, total, mean, and maximum duration (in milliseconds)
+        of each traced callable, slowest first.
+    """
+    totals: dict[str, dict[str, t.Any]] = {}
+    for event in events:
+        entry = totals.setdefault(
+            event["name"],
+            {"name": event["name"], "calls": 0, "total": 0.0, "max": 0.0},
+        )
+        entry["calls"] += 1
+        entry["total"] += event["dur"] / 1000
+        entry["max"] = max(entry["max"], event["dur"] / 1000)
+    for entry in totals.values():
+        entry["mean"] = entry["total"] / entry["calls"]
+    return sorted(totals.values(), key=lambda _: _["total"], reverse=True)
+
+
+def build_finished(_: Sphinx, __: Exception | None) -> None:
+    """Merge the spans of every process and write the trace files.
+
+    The trace is written regardless of the build's outcome.
+
+    :param _: The Sphinx application instance (unused).
+    :param __: An exception raised during the build process, or `None`
+        if the build was successful (unused).
+    """
+    global enabled
+    if not enabled or directory is None:
+        return
+    events = list(spans)
+    for path in sorted(directory.glob("*.jsonl")):
+        with path.open(encoding="utf-8") as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+        path.unlink()
+    events.sort(key=lambda _: _["ts"])
+    trace = directory / "trace.json"
+    trace.write_text(
+        json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}),
+        encoding="utf-8",
+    )
+    summary = summarise(events)
+    (directory / "summary.json").write_text(
+        json.dumps(summary, indent=2),
+        encoding="utf-8",
+    )
+    logger.info("Build trace written to %s, slowest calls:", trace)
+    for entry in summary[:top]:
+        logger.info(
+            "%10.2f ms %8d calls %10.3f ms max  %s",
+            entry["total"],
+            entry["calls"],
+            entry["max"],
+            entry["name"],
+        )
+    spans.clear()
+    enabled = False
@@ -0,0 +1,96 @@
+"""\
+Theme Transforms
+================
+
+Author: Akshay Mestry <xa@mes3.dev>
+Created on: 19 October, 2026
+Last updated on: 19 October, 2026
+
+This module defines the theme's doctree-level fix-ups as a single
+post-transform, which visits every element of a resolved doctree once
+and dispatches it to the handlers registered for its node type.
+
+The handlers are registered using the `handles` decorator and receive
+the element along with a per-document `state`, which caches the values
+that would otherwise be looked up by walking the whole document again,
+e.g., the page title.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+import docutils.nodes as nodes
+from sphinx.transforms.post_transforms import SphinxPostTransform
+
+from theme.extensions.utils import findall
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable
+
+    Handler = Callable[[nodes.Element, "state"], None]
+
+handlers: dict[type[nodes.Element], list[Handler]] = {}
+
+
+class state:
+    """Per-document values shared by the handlers.
+
+    :param document: The document being transformed.
+    """
+
+    def __init__(self, document: nodes.document) -> None:
+        """Initialise the state with nothing cached yet."""
+        self.document = document
+        self._title: str | None = None
+
+    @property
+    def title(self) -> str:
+        """Return the text of the page's (first) title, looked up only
+        once per document.
+        """
+        if self._title is None:
+            title = next(iter(findall(self.document, nodes.title)), None)
+            self._title = title.children[-1].astext().strip() if title else ""
+        return self._title
+
+
+def handles(*types: type[nodes.Element]) -> Callable[[Handler], Handler]:
+    """Register a handler for the given node types."""
+
+    def decorator(handler: Handler) -> Handler:
+        """Add the handler to the registry."""
+        for kind in types:
+            handlers.setdefault(kind, []).append(handler)
+        return handler
+
+    return decorator
+
+
+@handles(nodes.reference)
+def email_subject(node: nodes.Element, state: state) -> None:
+    """Fill the subject of the `mailto` links created by the `email`
+    role, which defaults to the page's title.
+    """
+    if "email" in node and "subject" not in node:
+        node["refuri"] = f"mailto:{node['email']}?subject={state.title}"
+
+
+class transform(SphinxPostTransform):
+    """Apply the theme's fix-ups to a resolved doctree in one pass.
+
+    Every element is guaranteed to have a `classes` attribute, which
+    some of Sphinx's internals expect but not all the nodes (created by
+    other extensions) provide, before being dispatched to the handlers
+    registered for its type.
+    """
+
+    default_priority = 900
+
+    def run(self, **_: t.Any) -> None:
+        """Visit every element of the document once."""
+        context = state(self.document)
+        for node in findall(self.document, nodes.Element):
+            node.setdefault("classes", [])
+            for handler in handlers.get(type(node), ()):
+                handler(node, context)
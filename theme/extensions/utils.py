@@ -4,7 +4,7 @@ Theme Utilities
 
 Author: Akshay Mestry <xa@mes3.dev>
 Created on: 21 February, 2025
-Last updated on: 14 January, 2026
+Last updated on: 19 October, 2026
 
 This module defines a collection of utility functions used for
 customising this sphinx theme. These utilities focus on enhancing the
@@ -24,30 +24,105 @@ internal APIs and dynamic JavaScript bindings.
 
     Use of `website_options` in favour of `html_context`. This removes
     the need of `register_website_options` function.
+
+.. versionchanged:: 19.10.2026
+
+    The pages are post-processed if they were written by the current
+    build, instead of only when their sources were read again.
 """
 
 from __future__ import annotations
 
+import hashlib
+import os
 import re
 import shlex
+import time
 import typing as t
+from datetime import UTC
 from datetime import datetime as dt
 from pathlib import Path
 from subprocess import CalledProcessError
 from subprocess import check_output as co
 
 import bs4
-from docutils import nodes
+from sphinx.util import logging
 from sphinx.util.display import status_iterator
 
+from theme.extensions import images
+from theme.extensions import sections
+
 if t.TYPE_CHECKING:
+    from docutils import nodes
     from sphinx.application import Sphinx
-    from sphinx.environment import BuildEnvironment
+
+logger = logging.getLogger(__name__)
 
 LAST_UPDATED_RE: re.Pattern[str] = re.compile(
     r"^\.\.\s+Last updated on:\s*(.+)$", re.IGNORECASE
 )
 
+WHITESPACE_RE: re.Pattern[str] = re.compile(r"\s+")
+UNQUOTED_RE: re.Pattern[str] = re.compile(r"[^\s\"'=<>`]+")
+
+marker: t.Final[bytes] = b"<!-- kaamiki:postprocess -->"
+preformatted: t.Final[frozenset[str]] = frozenset(
+    ("code", "pre", "script", "style", "textarea")
+)
+blocks: t.Final[frozenset[str]] = frozenset(
+    (
+        "article",
+        "aside",
+        "body",
+        "dd",
+        "details",
+        "div",
+        "dl",
+        "dt",
+        "figcaption",
+        "figure",
+        "footer",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "head",
+        "header",
+        "html",
+        "li",
+        "link",
+        "main",
+        "meta",
+        "nav",
+        "ol",
+        "p",
+        "pre",
+        "script",
+        "section",
+        "style",
+        "summary",
+        "table",
+        "tbody",
+        "td",
+        "tfoot",
+        "th",
+        "thead",
+        "title",
+        "tr",
+        "ul",
+    )
+)
+redundant_attributes: t.Final[dict[str, dict[str, str]]] = {
+    "form": {"method": "get"},
+    "input": {"type": "text"},
+    "link": {"type": "text/css"},
+    "script": {"type": "text/javascript"},
+    "style": {"type": "text/css"},
+}
+
 
 def findall(
     node: nodes.Node,
@@ -80,6 +155,12 @@ def make_toc_collapsible(tree: bs4.BeautifulSoup) -> None:
     pseudo element. No Alpine attributes or inline SVGs are injected.
 
     :param tree: Parsed HTML tree to mutate.
+
+    .. versionchanged:: 19.10.2026
+
+        The branch IDs are derived from a content digest instead of the
+        (salted) built-in `hash`, and the classes keep their order, so
+        that the same sources produce the same pages.
     """
     for link in tree.select("#left-sidebar a"):
         children = link.find_next_sibling("ul")
@@ -89,14 +170,15 @@ def make_toc_collapsible(tree: bs4.BeautifulSoup) -> None:
         if not parent or parent.name != "li":
             continue
         if not children.get("id"):
-            children["id"] = f"nav-branch-{abs(hash(str(children))) % (10**8)}"
+            digest = hashlib.sha256(str(children).encode()).hexdigest()
+            children["id"] = f"nav-branch-{digest[:8]}"
         current = (
             "current" in (parent.get("class") or [])
             or "current" in (link.get("class") or [])
             or bool(children.select(".current"))
         )
         parent["class"] = list(
-            set((parent.get("class") or []) + ["has-children"])
+            dict.fromkeys([*(parent.get("class") or []), "has-children"])
         )
         if current:
             parent["aria-expanded"] = "true"
@@ -179,7 +261,87 @@ def open_links_in_new_tab(tree: bs4.BeautifulSoup) -> None:
         link["target"] = "_blank"
 
 
-def postprocess(html: str, app: Sphinx) -> None:
+def collapse_whitespace(tree: bs4.BeautifulSoup) -> None:
+    """Collapse the whitespace between the tags of the HTML tree.
+
+    Runs of whitespace are collapsed into a single space, and the ones
+    between two block-level elements are removed altogether, as they
+    don't render anything. The whitespace within the preformatted
+    elements, i.e., `pre`, `textarea`, `code`, scripts, and styles, is
+    left untouched.
+
+    :param tree: Parsed HTML tree to mutate.
+    """
+    for text in tree.find_all(string=True):
+        if type(text) is not bs4.NavigableString or any(
+            parent.name in preformatted for parent in text.parents
+        ):
+            continue
+        collapsed = WHITESPACE_RE.sub(" ", text)
+        if collapsed == " " and all(
+            node is None
+            or isinstance(node, bs4.BeautifulSoup | bs4.Doctype)
+            or (isinstance(node, bs4.Tag) and node.name in blocks)
+            for node in (text.parent, text.previous_sibling, text.next_sibling)
+        ):
+            text.extract()
+        elif collapsed != text:
+            text.replace_with(collapsed)
+
+
+def quote(value: str) -> str:
+    """Quote an attribute value the way Beautiful Soup does, i.e., in
+    double quotes, unless only the double quotes appear in the value.
+    """
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"{}"'.format(value.replace('"', "&quot;"))
+
+
+class minifier(bs4.formatter.HTMLFormatter):
+    """Formatter for serialising the HTML tree with fewer bytes.
+
+    The attributes are written without the optional quotes, empty ones
+    as booleans, and the ones set to their default values are dropped.
+    The void elements are written without the closing slash. Alpine.js
+    attributes, i.e., the ones starting with `@`, `:`, or `x-`, are
+    always written as they are.
+    """
+
+    def __init__(self) -> None:
+        """Initialise the formatter with the minimal entity escaping."""
+        super().__init__(
+            entity_substitution=bs4.dammit.EntitySubstitution.substitute_xml,
+            void_element_close_prefix="",
+        )
+
+    def attributes(self, tag: bs4.Tag) -> list[tuple[str, None]]:
+        """Return the tag's attributes, each rendered as its key.
+
+        The attributes are rendered here, as the quoting is otherwise
+        decided without knowing the attribute's name.
+        """
+        redundant = redundant_attributes.get(tag.name, {})
+        rendered: list[tuple[str, None]] = []
+        for key, value in sorted(tag.attrs.items()):
+            text = " ".join(value) if isinstance(value, list) else value
+            text = self.attribute_value(str(text))
+            alpine = key.startswith(("@", ":", "x-"))
+            if redundant.get(key) == text.lower():
+                continue
+            if not text and not alpine:
+                attribute = key
+            elif UNQUOTED_RE.fullmatch(text) and not alpine:
+                attribute = f"{key}={text}"
+            else:
+                attribute = f"{key}={quote(text)}"
+            rendered.append((attribute, None))
+        return rendered
+
+
+def postprocess(html: str, app: Sphinx) -> tuple[int, int, float]:
     """Perform post-processing on an HTML document after the Sphinx
     build.
 
@@ -195,52 +357,67 @@ def postprocess(html: str, app: Sphinx) -> None:
     :param html: Path to the HTML file to be post-processed.
     :param app: The Sphinx application instance, used to access the
         current build's options and environment.
+    :return: A tuple of the page's size before and after minifying
+        it, in bytes, and the time spent minifying it, in seconds.
+
+    .. versionchanged:: 19.10.2026
+
+        [1] The page is minified if `minify_html` is enabled in the
+            `html_context`.
+        [2] The page's images are given their intrinsic dimensions
+            and loading hints (see `images.annotate`).
+        [3] The sections of a long article are rendered on demand if
+            `content_visibility` is enabled (see `sections.defer`).
     """
-    app = app or None  # Just to satisfy type checkers
     with open(html, encoding="utf-8") as f:
-        tree = bs4.BeautifulSoup(f, "html.parser")
+        tree = bs4.BeautifulSoup(f.read(), "html.parser")
     open_links_in_new_tab(tree)
     add_copy_to_headerlinks(tree)
     make_toc_collapsible(tree)
     remove_empty_toctree_divs(tree)
     remove_comments(tree)
+    images.annotate(tree, html)
+    if app.config.html_context.get("content_visibility"):
+        sections.defer(tree)
+    # NOTE: The size before is measured on the post-processed page, so
+    # that the comments and the like removed above don't count towards
+    # the bytes saved by minifying it.
+    text = str(tree)
+    before = len(text.encode())
+    elapsed = 0.0
+    if app.config.html_context.get("minify_html"):
+        start = time.perf_counter()
+        collapse_whitespace(tree)
+        text = tree.decode(formatter=minifier())
+        elapsed = time.perf_counter() - start
     with open(html, "w", encoding="utf-8") as f:
-        f.write(str(tree))
+        f.write(text)
+    return before, len(text.encode()), elapsed
 
 
-def env_before_read_docs(
-    app: Sphinx, _: BuildEnvironment, docnames: list[str]
-) -> None:
-    """Track the list of documents modified during the Sphinx build.
+def rewritten(app: Sphinx) -> list[str]:
+    """Return the pages written, but not yet post-processed, by the
+    current build.
 
-    This function captures the list of document names that have been
-    added, updated, or deleted, and stores them in the Sphinx
-    environment for later use. This ensures that post-processing only
-    affects pages that have actually changed, optimising the build
-    process by avoiding unnecessary rework.
+    Every page rendered using the theme's layout carries a `marker`
+    comment in its `<head>`, which is removed along with every other
+    comment by `postprocess`. Hence, a page still having the marker has
+    been written by the current build, regardless of why Sphinx wrote
+    it, e.g., its source changed or a template changed.
 
     :param app: The Sphinx application instance.
-    :param _: The current build environment (unused).
-    :param docnames: A list of document names that were modified.
-    """
-    app.env.theme_htmls = docnames
-
-
-def ensure_classes_on_nodes(
-    app: Sphinx, doctree: BuildEnvironment, docnames: list[str]
-) -> None:
-    """Make sure classes are handled properly on node-tree.
-
-    This patched function fixes the breaking code in sphinx's internal
-    structure when the nodes with no classes are not handled properly.
-
-    :param app: The Sphinx application instance (unused).
-    :param doctree: The current build environment.
-    :param docname: List of document names that are modified (unused).
+    :return: Paths of the pages to post-process.
     """
-    app = app or docnames  # Just to satisfy type checkers
-    for node in doctree.traverse(nodes.Element):
-        node.setdefault("classes", [])
+    htmls: list[str] = []
+    for docname in sorted(app.env.found_docs):
+        html = app.builder.get_outfilename(docname)
+        try:
+            with open(html, "rb") as f:
+                if marker in f.read(8192):
+                    htmls.append(html)
+        except FileNotFoundError:
+            continue
+    return htmls
 
 
 def last_updated_date(app: Sphinx, docname: str, source: list[str]) -> None:
@@ -253,6 +430,10 @@ def last_updated_date(app: Sphinx, docname: str, source: list[str]) -> None:
     from Git. If the document is not tracked by Git, it uses the file's
     last modified timestamp.
 
+    For reproducible builds, i.e., when `SOURCE_DATE_EPOCH` is set, the
+    timestamp is clamped to it and formatted in UTC instead of the
+    local timezone.
+
     :param app: The Sphinx application instance.
     :param docname: The name of the document being processed.
     :param source: The source content of the document as a list of
@@ -290,11 +471,12 @@ def last_updated_date(app: Sphinx, docname: str, source: list[str]) -> None:
         on = ""
     if not on:
         timestamp = src.stat().st_mtime
-        try:
-            tz = dt.now().astimezone().tzinfo or dt.timezone.utc
-            on = dt.fromtimestamp(timestamp, tz=tz).strftime("%b %d, %Y")
-        except FileNotFoundError:
-            on = ""
+        tz = dt.now().astimezone().tzinfo or UTC
+        epoch = os.environ.get("SOURCE_DATE_EPOCH")
+        if epoch and epoch.isdigit():
+            timestamp = min(timestamp, int(epoch))
+            tz = UTC
+        on = dt.fromtimestamp(timestamp, tz=tz).strftime("%b %d, %Y")
     if on:
         metadata["last_updated"] = on
 
@@ -306,8 +488,8 @@ def build_finished(app: Sphinx, exc: Exception | None) -> None:
     This function is triggered after the build process is completed. It
     checks if there are any errors, and if the builder is set to produce
     `HTML` or `dirhtml` output. It then applies final transformations
-    to the list of modified documents stored in the environment, such as
-    collapsible navigation, and comment removal.
+    to the pages written by the current build, such as collapsible
+    navigation, and comment removal.
 
     :param app: Sphinx application object.
     :param exc: Any exception raised during the build process, or None
@@ -324,15 +506,22 @@ def build_finished(app: Sphinx, exc: Exception | None) -> None:
     If an exception occurs during the build, post-processing is skipped
     to avoid further complications.
 
+    .. versionchanged:: 19.10.2026
+
+        The pages are picked using `rewritten`, and the bytes saved by
+        minifying them are reported if `minify_html` is enabled.
+
     :param app: The Sphinx application instance.
     :param exc: An exception raised during the build process, or `None`
         if the build was successful.
     """
     if exc or app.builder.name not in {"html", "dirhtml"}:
         return
-    htmls = [app.builder.get_outfilename(html) for html in app.env.theme_htmls]
+    htmls = rewritten(app)
     if not htmls:
         return
+    saved = total = 0
+    spent = 0.0
     for html in status_iterator(
         htmls,
         "Postprocessing... ",
@@ -340,4 +529,22 @@ def build_finished(app: Sphinx, exc: Exception | None) -> None:
         len(htmls),
         app.verbosity,
     ):
-        postprocess(html, app)
+        before, after, elapsed = postprocess(html, app)
+        saved += before - after
+        total += before
+        spent += elapsed
+        if app.config.html_context.get("minify_html"):
+            logger.verbose(
+                "Minified %s: saved %d bytes in %.1f ms",
+                html,
+                before - after,
+                elapsed * 1000,
+            )
+    if app.config.html_context.get("minify_html"):
+        logger.info(
+            "Minified %d pages: saved %.1f KiB (%.1f%%) in %.2f s",
+            len(htmls),
+            saved / 1024,
+            100 * saved / total,
+            spent,
+        )
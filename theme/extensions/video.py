@@ -4,7 +4,7 @@ Video Directive
 
 Author: Akshay Mestry <xa@mes3.dev>
 Created on: 22 February, 2025
-Last updated on: 02 November, 2025
+Last updated on: 19 October, 2026
 
 This module defines a custom `video` directive for this sphinx theme. The
 directive allows embedding a video directly within the document.
@@ -19,9 +19,23 @@ follows::
     .. code-block:: rst
 
         .. video:: https://www.w3schools.com/tags/movie.mp4
+            :lazy:
+            :poster: https://www.w3schools.com/tags/poster.png
 
 The above snippet will be processed and rendered according to the
 theme's Jinja2 template, producing a final HTML output.
+
+.. versionchanged:: 19.10.2026
+
+    [1] The parsed URL and caption are kept on the `video` node and
+        the template is rendered at write time.
+    [2] The pages with a video hosted elsewhere preconnect to its
+        domain.
+    [3] Added the `lazy` and `poster` options. A lazy video doesn't
+        preload, and its source is only attached by the `video`
+        script module as it nears the viewport. The autoplaying videos
+        are always lazy, and are paused and released when scrolled
+        away.
 """
 
 from __future__ import annotations
@@ -33,10 +47,16 @@ import docutils.nodes as nodes
 import docutils.parsers.rst as rst
 import jinja2
 
+from theme.extensions import cache
+from theme.extensions import hints
+
 if t.TYPE_CHECKING:
     from sphinx.writers.html import HTMLTranslator
 
+    from theme.extensions.hints import Origin
+
 name: t.Final[str] = "video"
+feature: t.Final[str] = "video"
 here: str = p.dirname(__file__)
 templates: str = "../base/templates"
 html = p.join(p.abspath(p.join(here, templates)), "video.html.jinja")
@@ -66,12 +86,17 @@ class directive(rst.Directive):
 
         - `autoplay`: Boolean flag to either autoplay the video on load.
         - `caption`: Video caption.
+        - `lazy`: Boolean flag to load the video only once it's near
+          the viewport.
+        - `poster`: URL of the image shown until the video plays.
     """
 
     has_content = True
     option_spec = {  # noqa: RUF012
         "autoplay": rst.directives.flag,
         "caption": rst.directives.unchanged,
+        "lazy": rst.directives.flag,
+        "poster": rst.directives.uri,
     }
 
     def run(self) -> list[nodes.Node]:
@@ -89,10 +114,18 @@ class directive(rst.Directive):
         """
         self.assert_has_content()
         self.options["url"] = rst.directives.uri("\n".join(self.content))
-        attributes: dict[str, str] = {}
-        attributes["text"] = template.render(**self.options)
-        attributes["format"] = "html"
-        return [nodes.raw(**attributes)]
+        self.options["autoplay"] = "autoplay" in self.options
+        self.options["lazy"] = self.options["autoplay"] or (
+            "lazy" in self.options
+        )
+        element = node("", **self.options)
+        return [element]
+
+
+def origins(node: node) -> list[Origin]:
+    """Return the origin of the video, unless it's part of the site."""
+    found = hints.origin(node["url"])
+    return [(found, False)] if found else []
 
 
 def visit(self: HTMLTranslator, node: node) -> None:
@@ -101,13 +134,14 @@ def visit(self: HTMLTranslator, node: node) -> None:
 
     This method is called when the HTML translator encounters the
     `video` node in the document tree. It retrieves the relevant
-    attributes from the node (if any) and uses Jinja2 templating to
-    produce the final HTML output. Since the `video` node does not
-    require any actions, the method currently acts as a placeholder.
+    attributes from the node and uses Jinja2 templating to produce the
+    final HTML output.
 
-    :param self: The HTML translator instance.
-    :param node: The `video` node being processed.
+    :param self: The HTML translator instance responsible for rendering
+        nodes into HTML.
+    :param node: The `video` node containing parsed attributes.
     """
+    self.body.append(cache.render(name, template, **node.attributes))
 
 
 def depart(self: HTMLTranslator, node: node) -> None:
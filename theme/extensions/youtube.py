@@ -4,7 +4,7 @@ YouTube Directive
 
 Author: Akshay Mestry <xa@mes3.dev>
 Created on: 22 February, 2025
-Last updated on: 22 December, 2025
+Last updated on: 19 October, 2026
 
 This module defines a custom `youtube` directive for this sphinx theme.
 The directive allows embedding a YouTube video directly within the
@@ -23,6 +23,12 @@ follows::
 
 The above snippet will be processed and rendered according to the
 theme's Jinja2 template, producing a final HTML output.
+
+.. versionchanged:: 19.10.2026
+
+    [1] The `youtube` node only holds the parsed options now, the
+        embed URL and the markup are built while writing the page.
+    [2] The pages with a player preconnect to its domain.
 """
 
 from __future__ import annotations
@@ -35,9 +41,14 @@ import docutils.nodes as nodes
 import docutils.parsers.rst as rst
 import jinja2
 
+from theme.extensions import cache
+from theme.extensions import hints
+
 if t.TYPE_CHECKING:
     from sphinx.writers.html import HTMLTranslator
 
+    from theme.extensions.hints import Origin
+
 name: t.Final[str] = "youtube"
 here: str = p.dirname(__file__)
 templates: str = "../base/templates"
@@ -98,34 +109,47 @@ class directive(rst.Directive):
         :return: A list containing a single `node` element.
         """
         self.assert_has_content()
-        raw = self.content.pop()
-        src = rst.directives.uri(raw)
-        vid = src
-        if "youtu.be/" in src:
-            vid = src.rsplit("/", 1)[-1].split("?", 1)[0]
-        elif "watch?v=" in src:
-            vid = src.split("v=", 1)[-1].split("&", 1)[0]
-        domain = (
-            "https://www.youtube-nocookie.com"
-            if "privacy" in self.options
-            else "https://www.youtube.com"
-        )
-        params = {
-            "start": self.options.get("startfrom", 0),
-            "autoplay": 1 if "autoplay" in self.options else 0,
-            "cc_load_policy": 1 if "showcaptions" in self.options else 0,
-            "modestbranding": 1,
-            "rel": 0,
-            "playsinline": 1,
-        }
-        if "controls" in self.options:
-            params["controls"] = int(self.options["controls"])
-        url = f"{domain}/embed/{vid}?{urlparse.urlencode(params)}"
-        self.options["url"] = url
-        attributes: dict[str, str] = {}
-        attributes["text"] = template.render(**self.options)
-        attributes["format"] = "html"
-        return [nodes.raw(**attributes)]
+        self.options["src"] = rst.directives.uri(self.content[-1])
+        element = node("", **self.options)
+        return [element]
+
+
+def embed(node: node) -> str:
+    """Build the embed URL of a `youtube` node from its options.
+
+    :param node: The `youtube` node containing parsed attributes.
+    :return: The URL of the embedded player.
+    """
+    src = node["src"]
+    vid = src
+    if "youtu.be/" in src:
+        vid = src.rsplit("/", 1)[-1].split("?", 1)[0]
+    elif "watch?v=" in src:
+        vid = src.split("v=", 1)[-1].split("&", 1)[0]
+    domain = (
+        "https://www.youtube-nocookie.com"
+        if "privacy" in node
+        else "https://www.youtube.com"
+    )
+    params = {
+        "start": node.get("startfrom", 0),
+        "autoplay": 1 if "autoplay" in node else 0,
+        "cc_load_policy": 1 if "showcaptions" in node else 0,
+        "modestbranding": 1,
+        "rel": 0,
+        "playsinline": 1,
+    }
+    if "controls" in node:
+        params["controls"] = int(node["controls"])
+    return f"{domain}/embed/{vid}?{urlparse.urlencode(params)}"
+
+
+def origins(node: node) -> list[Origin]:
+    """Return the origin of the embedded player, which depends on the
+    `privacy` option.
+    """
+    found = hints.origin(embed(node))
+    return [(found, False)] if found else []
 
 
 def visit(self: HTMLTranslator, node: node) -> None:
@@ -134,13 +158,16 @@ def visit(self: HTMLTranslator, node: node) -> None:
 
     This method is called when the HTML translator encounters the
     `youtube` node in the document tree. It retrieves the relevant
-    attributes from the node (if any) and uses Jinja2 templating to
-    produce the final HTML output. Since the `youtube` node does not
-    require any actions, the method currently acts as a placeholder.
+    attributes from the node and uses Jinja2 templating to produce the
+    final HTML output.
 
-    :param self: The HTML translator instance.
-    :param node: The `youtube` node being processed.
+    :param self: The HTML translator instance responsible for rendering
+        nodes into HTML.
+    :param node: The `youtube` node containing parsed attributes.
     """
+    self.body.append(
+        cache.render(name, template, **node.attributes, url=embed(node))
+    )
 
 
 def depart(self: HTMLTranslator, node: node) -> None: